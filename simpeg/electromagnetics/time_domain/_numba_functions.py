@@ -0,0 +1,183 @@
+"""
+Numba functions for TDEM receiver projections.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+
+try:
+    import numba
+except ImportError:
+    # Define dummy jit decorator
+    def jit(*args, **kwargs):
+        return lambda f: f
+
+    numba = None
+    prange = range
+else:
+    from numba import jit, prange
+
+
+@jit(nopython=True, cache=True)
+def _csr_kron_fill(
+    a_indptr,
+    a_indices,
+    a_data,
+    b_indptr,
+    b_indices,
+    b_data,
+    b_n_cols,
+    indptr,
+    indices,
+    data,
+):
+    """
+    Fill the CSR arrays of the Kronecker product of two CSR matrices
+
+    Parameters
+    ----------
+    a_indptr, a_indices, a_data : numpy.ndarray
+        CSR arrays of the left matrix ``A``.
+    b_indptr, b_indices, b_data : numpy.ndarray
+        CSR arrays of the right matrix ``B``.
+    b_n_cols : int
+        Number of columns of ``B``.
+    indptr : (n_rows_a * n_rows_b + 1,) numpy.ndarray
+        Array where the row pointers of ``kron(A, B)`` are stored.
+    indices, data : (nnz_a * nnz_b,) numpy.ndarray
+        Arrays where the column indices and values of ``kron(A, B)`` are
+        stored.
+    """
+    n_rows_a = a_indptr.size - 1
+    n_rows_b = b_indptr.size - 1
+    pos = 0
+    indptr[0] = 0
+    for i in range(n_rows_a):
+        for j in range(n_rows_b):
+            for ka in range(a_indptr[i], a_indptr[i + 1]):
+                col_a = a_indices[ka] * b_n_cols
+                val_a = a_data[ka]
+                for kb in range(b_indptr[j], b_indptr[j + 1]):
+                    indices[pos] = col_a + b_indices[kb]
+                    data[pos] = val_a * b_data[kb]
+                    pos += 1
+            indptr[i * n_rows_b + j + 1] = pos
+
+
+@jit(nopython=True, parallel=True, cache=True)
+def _kron_project(
+    ps_indptr, ps_indices, ps_data, pt_indptr, pt_indices, pt_data, F, out
+):
+    """
+    Compute ``vec(Ps @ F @ Pt.T)`` without forming ``Ps @ F``
+
+    Parameters
+    ----------
+    ps_indptr, ps_indices, ps_data : numpy.ndarray
+        CSR arrays of the spatial projection ``Ps``.
+    pt_indptr, pt_indices, pt_data : numpy.ndarray
+        CSR arrays of the time projection ``Pt``.
+    F : (n_grid, n_time_grid) numpy.ndarray
+        Field at every grid location and time.
+    out : (n_loc * n_times,) numpy.ndarray
+        Array where the result is stored, with the locations changing fastest.
+    """
+    n_loc = ps_indptr.size - 1
+    n_times = pt_indptr.size - 1
+    for i in prange(n_loc):
+        for j in range(n_times):
+            acc = 0.0
+            for k1 in range(ps_indptr[i], ps_indptr[i + 1]):
+                row = ps_indices[k1]
+                partial = 0.0
+                for k2 in range(pt_indptr[j], pt_indptr[j + 1]):
+                    partial += pt_data[k2] * F[row, pt_indices[k2]]
+                acc += ps_data[k1] * partial
+            out[i + j * n_loc] = acc
+
+
+def kron_project(Ps, Pt, F):
+    """
+    Project a space-time field with the Kronecker product of two projections
+
+    Computes ``kron(Pt, Ps) @ vec(F) = vec(Ps @ F @ Pt.T)`` with a fused
+    Numba kernel that only reads the entries of ``F`` selected by both
+    projections. Falls back to two SciPy sparse-dense products if Numba is
+    not installed or ``F`` is not a real 2D array.
+
+    Parameters
+    ----------
+    Ps : (n_loc, n_grid) scipy.sparse.csr_matrix
+        Spatial projection matrix.
+    Pt : (n_times, n_time_grid) scipy.sparse.csr_matrix
+        Time projection matrix.
+    F : (n_grid, n_time_grid) numpy.ndarray
+        Field at every grid location and time.
+
+    Returns
+    -------
+    (n_loc * n_times,) numpy.ndarray
+    """
+    if numba is None or F.ndim != 2 or np.iscomplexobj(F):
+        return (Pt @ (Ps @ F).T).ravel()
+    out = np.empty(Ps.shape[0] * Pt.shape[0], dtype=np.result_type(Ps.dtype, F.dtype))
+    _kron_project(
+        Ps.indptr, Ps.indices, Ps.data, Pt.indptr, Pt.indices, Pt.data, F, out
+    )
+    return out
+
+
+def _index_dtype(*sizes):
+    """Smallest of int32 or int64 able to index arrays of the given sizes."""
+    if max(sizes) < np.iinfo(np.int32).max:
+        return np.int32
+    return np.int64
+
+
+def csr_kron(A, B):
+    """
+    Kronecker product of two sparse matrices in CSR format
+
+    Writes the CSR arrays of ``kron(A, B)`` directly instead of going through
+    an intermediate COO matrix. Falls back to :func:`scipy.sparse.kron` if
+    Numba is not installed. In both cases, ``int32`` indices are used whenever
+    the product is small enough.
+
+    Parameters
+    ----------
+    A, B : scipy.sparse.spmatrix
+        Sparse matrices.
+
+    Returns
+    -------
+    scipy.sparse.csr_matrix
+    """
+    if numba is None:
+        K = sp.kron(A, B, format="csr")
+        index_dtype = _index_dtype(K.nnz, *K.shape)
+        K.indices = K.indices.astype(index_dtype, copy=False)
+        K.indptr = K.indptr.astype(index_dtype, copy=False)
+        return K
+
+    A = sp.csr_matrix(A)
+    B = sp.csr_matrix(B)
+    shape = (A.shape[0] * B.shape[0], A.shape[1] * B.shape[1])
+    nnz = A.nnz * B.nnz
+    index_dtype = _index_dtype(nnz, *shape)
+
+    indptr = np.empty(shape[0] + 1, dtype=index_dtype)
+    indices = np.empty(nnz, dtype=index_dtype)
+    data = np.empty(nnz, dtype=np.result_type(A.dtype, B.dtype))
+    _csr_kron_fill(
+        A.indptr,
+        A.indices,
+        A.data,
+        B.indptr,
+        B.indices,
+        B.data,
+        B.shape[1],
+        indptr,
+        indices,
+        data,
+    )
+    return sp.csr_matrix((data, indices, indptr), shape=shape)
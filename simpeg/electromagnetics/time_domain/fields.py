@@ -566,6 +566,7 @@ class Fields3DMagneticField(FieldsTDEM):
         # Docstring inherited from parent.
         self._times = self.simulation.times
         self._edgeCurl = self.simulation.mesh.edge_curl
+        self._edgeCurlT = self.simulation._Ct_csr
         self._MeMuI = self.simulation.MeMuI
         self._MeMu = self.simulation.MeMu
         self._MfRho = self.simulation.MfRho
@@ -588,27 +589,30 @@ class Fields3DMagneticField(FieldsTDEM):
 
     def _dhdt(self, hSolution, source_list, tInd):
         C = self._edgeCurl
+        Ct = self._edgeCurlT
         MeMuI = self._MeMuI
         MfRho = self._MfRho
 
-        dhdt = -MeMuI * (C.T * (MfRho * (C * hSolution)))
+        dhdt = -MeMuI * (Ct * (MfRho * (C * hSolution)))
 
         for i, src in enumerate(source_list):
             s_m, s_e = src.eval(self.simulation, self._times[tInd])
-            dhdt[:, i] = MeMuI * (C.T * MfRho * s_e + s_m) + dhdt[:, i]
+            dhdt[:, i] = MeMuI * (Ct * (MfRho * s_e) + s_m) + dhdt[:, i]
         return dhdt
 
     def _dhdtDeriv_u(self, tInd, src, dun_dm_v, adjoint=False):
         C = self._edgeCurl
+        Ct = self._edgeCurlT
         MeMuI = self._MeMuI
         MfRho = self._MfRho
 
         if adjoint:
-            return -C.T * (MfRho.T * (C * (MeMuI * dun_dm_v)))
-        return -MeMuI * (C.T * (MfRho * (C * dun_dm_v)))
+            return -(Ct * (MfRho.T * (C * (MeMuI * dun_dm_v))))
+        return -MeMuI * (Ct * (MfRho * (C * dun_dm_v)))
 
     def _dhdtDeriv_m(self, tInd, src, v, adjoint=False):
         C = self._edgeCurl
+        Ct = self._edgeCurlT
         MeMuI = self._MeMuI
         MfRhoDeriv = self._MfRhoDeriv
 
@@ -617,7 +621,7 @@ class Fields3DMagneticField(FieldsTDEM):
 
         if adjoint:
             return -MfRhoDeriv(C * hSolution - s_e, (C * (MeMuI * v)), adjoint)
-        return -MeMuI * (C.T * (MfRhoDeriv(C * hSolution - s_e, v, adjoint)))
+        return -MeMuI * (Ct * (MfRhoDeriv(C * hSolution - s_e, v, adjoint)))
 
     def _j(self, hSolution, source_list, tInd):
         s_e = np.zeros((self.mesh.nF, len(source_list)))
@@ -775,6 +779,7 @@ class Fields3DCurrentDensity(FieldsTDEM):
         # Docstring inherited from parent.
         self._times = self.simulation.times
         self._edgeCurl = self.simulation.mesh.edge_curl
+        self._edgeCurlT = self.simulation._Ct_csr
         self._MeMuI = self.simulation.MeMuI
         self._MfRho = self.simulation.MfRho
         self._MfRhoDeriv = self.simulation.MfRhoDeriv
@@ -798,11 +803,11 @@ class Fields3DCurrentDensity(FieldsTDEM):
         )
 
     def _dhdt(self, jSolution, source_list, tInd):
-        C = self._edgeCurl
+        Ct = self._edgeCurlT
         MfRho = self._MfRho
         MeMuI = self._MeMuI
 
-        dhdt = -MeMuI * (C.T * (MfRho * jSolution))
+        dhdt = -MeMuI * (Ct * (MfRho * jSolution))
         for i, src in enumerate(source_list):
             s_m = src.s_m(self.simulation, self.simulation.times[tInd])
             dhdt[:, i] = MeMuI * s_m + dhdt[:, i]
@@ -810,21 +815,23 @@ class Fields3DCurrentDensity(FieldsTDEM):
 
     def _dhdtDeriv_u(self, tInd, src, dun_dm_v, adjoint=False):
         C = self._edgeCurl
+        Ct = self._edgeCurlT
         MfRho = self._MfRho
         MeMuI = self._MeMuI
 
         if adjoint is True:
             return -MfRho.T * (C * (MeMuI.T * dun_dm_v))
-        return -MeMuI * (C.T * (MfRho * dun_dm_v))
+        return -MeMuI * (Ct * (MfRho * dun_dm_v))
 
     def _dhdtDeriv_m(self, tInd, src, v, adjoint=False):
         jSolution = self[[src], "jSolution", tInd].flatten()
         C = self._edgeCurl
+        Ct = self._edgeCurlT
         MeMuI = self._MeMuI
 
         if adjoint is True:
             return -self._MfRhoDeriv(jSolution, C * (MeMuI * v), adjoint)
-        return -MeMuI * (C.T * (self._MfRhoDeriv(jSolution, v)))
+        return -MeMuI * (Ct * (self._MfRhoDeriv(jSolution, v)))
 
     def _e(self, jSolution, source_list, tInd):
         return self.simulation.MfI * (
@@ -1,8 +1,178 @@
+import threading
+import weakref
+from weakref import WeakKeyDictionary
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
 import scipy.sparse as sp
+from scipy.sparse.linalg import LinearOperator
 
-from ...utils import mkvc, validate_type, validate_direction
+from ...utils import validate_type, validate_direction, validate_integer
 from discretize.utils import Zero
 from ...survey import BaseTimeRx
+from ._numba_functions import csr_kron, kron_project
+
+# In-memory cache of spatial projection matrices shared by all TDEM receivers.
+# The cache is process-global: every simulation in the process reads and fills
+# it, and access is serialized with a lock. Entries hold a weak reference to the
+# mesh they were built on so a recycled ``id`` never returns a stale matrix, and
+# are dropped once that mesh is garbage collected. Cached matrices are read-only
+# since the same object is handed to every receiver at the same locations.
+_projection_cache = OrderedDict()
+_projection_cache_size = 128
+_projection_cache_lock = threading.RLock()
+
+
+def set_memory_cache(size):
+    """Set the number of projection matrices kept in the in-memory cache.
+
+    The spatial projection matrices of all TDEM receivers are kept in a single
+    process-global cache, regardless of ``storeProjections``, so repeated
+    calls to ``eval`` and ``evalDeriv`` do not rebuild the interpolation
+    matrices. The cache is shared by every simulation in the process and the
+    least recently used entries are discarded first. Cached matrices are
+    read-only.
+
+    Entries are keyed by the mesh object along with its number of cells,
+    origin, cell widths and orientation, so changing those in place does not
+    return projections for the previous grid. Call :func:`clear_memory_cache`
+    after any other in-place change of a mesh geometry, e.g. moving the nodes
+    of a ``CurvilinearMesh``.
+
+    Parameters
+    ----------
+    size : int
+        Maximum number of cached projection matrices. Use ``0`` to disable
+        the cache.
+    """
+    global _projection_cache_size
+    _projection_cache_size = validate_integer("size", size, min_val=0)
+    with _projection_cache_lock:
+        while len(_projection_cache) > _projection_cache_size:
+            _projection_cache.popitem(last=False)
+
+
+def clear_memory_cache():
+    """Remove all projection matrices from the process-global in-memory cache."""
+    with _projection_cache_lock:
+        _projection_cache.clear()
+
+
+def _get_stored(store, mesh, time_mesh):
+    """Projection stored for ``mesh`` and ``time_mesh``, or ``None``."""
+    per_time_mesh = store.get(mesh)
+    if per_time_mesh is None:
+        return None
+    return per_time_mesh.get(time_mesh)
+
+
+@lru_cache(maxsize=None)
+def _component_grids(grid_location):
+    """Names of the x, y and z components of a grid location, e.g. 'Fx'."""
+    return tuple(grid_location + comp for comp in "xyz")
+
+
+def _set_read_only(P):
+    """Make the arrays of the sparse matrix ``P`` read-only."""
+    for name in ("data", "indices", "indptr"):
+        arr = getattr(P, name, None)
+        if arr is not None:
+            arr.flags.writeable = False
+    return P
+
+
+def _drop_projection(key, mesh_ref):
+    """Remove the entry of ``key`` if it still refers to ``mesh_ref``."""
+    with _projection_cache_lock:
+        entry = _projection_cache.get(key)
+        if entry is not None and entry[0] is mesh_ref:
+            del _projection_cache[key]
+
+
+def _mesh_key(mesh):
+    """Identity and geometry of ``mesh`` used in the projection cache keys."""
+    orientation = getattr(mesh, "orientation", None)
+    return (
+        id(mesh),
+        mesh.n_cells,
+        np.asarray(mesh.origin).tobytes(),
+        tuple(np.asarray(h).tobytes() for h in getattr(mesh, "h", ())),
+        None if orientation is None else np.asarray(orientation).tobytes(),
+    )
+
+
+def _cached_projection(key, mesh, build):
+    """Return the cached projection for ``key``, building it on a miss."""
+    key = (_mesh_key(mesh),) + key
+    with _projection_cache_lock:
+        entry = _projection_cache.get(key)
+        if entry is not None:
+            mesh_ref, P = entry
+            if mesh_ref() is mesh:
+                _projection_cache.move_to_end(key)
+                return P
+            del _projection_cache[key]
+
+    P = _set_read_only(build())
+    with _projection_cache_lock:
+        if _projection_cache_size > 0:
+            _projection_cache[key] = (
+                weakref.ref(mesh, lambda ref, key=key: _drop_projection(key, ref)),
+                P,
+            )
+            while len(_projection_cache) > _projection_cache_size:
+                _projection_cache.popitem(last=False)
+    return P
+
+
+class _KronLinearOperator(LinearOperator):
+    r"""Lazy Kronecker product ``sp.kron(Pt, Ps)`` of two projection matrices.
+
+    Uses the identity :math:`(P_t \otimes P_s) \, vec(F) = vec(P_s F P_t^T)`,
+    with a column-major :math:`vec`, so the full projection matrix is never
+    formed.
+
+    Parameters
+    ----------
+    Ps : (n_loc, n_grid) scipy.sparse.csr_matrix
+        Spatial projection matrix.
+    Pt : (n_times, n_time_grid) scipy.sparse.csr_matrix
+        Time projection matrix.
+    """
+
+    def __init__(self, Ps, Pt):
+        self.Ps = sp.csr_matrix(Ps)
+        self.Pt = sp.csr_matrix(Pt)
+        shape = (
+            self.Pt.shape[0] * self.Ps.shape[0],
+            self.Pt.shape[1] * self.Ps.shape[1],
+        )
+        super().__init__(
+            dtype=np.result_type(self.Ps.dtype, self.Pt.dtype), shape=shape
+        )
+
+    def project(self, F):
+        """Project a field sampled on the space-time grid to the receivers.
+
+        Parameters
+        ----------
+        F : (n_grid, n_time_grid) numpy.ndarray
+            Field at every grid location (rows) and time (columns).
+
+        Returns
+        -------
+        (n_loc * n_times) numpy.ndarray
+            The projected field, ordered with the locations changing fastest.
+        """
+        return kron_project(self.Ps, self.Pt, F)
+
+    def _matvec(self, x):
+        return self.project(x.reshape((self.Ps.shape[1], self.Pt.shape[1]), order="F"))
+
+    def _rmatvec(self, y):
+        Y = y.reshape((self.Ps.shape[0], self.Pt.shape[0]), order="F")
+        return (self.Pt.T @ (self.Ps.T @ Y).T).ravel()
 
 
 class BaseRx(BaseTimeRx):
@@ -37,6 +207,13 @@ class BaseRx(BaseTimeRx):
 
         self.orientation = orientation
         self.use_source_receiver_offset = use_source_receiver_offset
+        # stored projections are keyed mesh -> time_mesh -> P with weak
+        # references, so they are released together with the meshes
+        self._Ps = WeakKeyDictionary()
+        self._PTs = WeakKeyDictionary()
+        # time projections of this receiver, keyed time_mesh -> fields class
+        # and time channels
+        self._time_Ps = WeakKeyDictionary()
         super().__init__(locations=locations, times=times, **kwargs)
 
     @property
@@ -53,6 +230,8 @@ class BaseRx(BaseTimeRx):
     @orientation.setter
     def orientation(self, var):
         self._orientation = validate_direction("orientation", var, dim=3)
+        # indices of the x, y, z components sampled by the receiver
+        self._orientation_idx = tuple(int(i) for i in np.flatnonzero(self._orientation))
 
     @property
     def use_source_receiver_offset(self):
@@ -91,14 +270,35 @@ class BaseRx(BaseTimeRx):
         -------
         scipy.sparse.csr_matrix
             P, the interpolation matrix
+
+        Notes
+        -----
+        The interpolation matrix of each component is kept in the in-memory
+        projection cache, so receivers at the same locations share it across
+        orientations and receiver types. The returned matrix is never the
+        cached one and can be modified in place.
         """
+        P = self._get_spatial_projection(mesh, f)
+        if not P.data.flags.writeable:
+            # the read-only matrix shared through the projection cache
+            P = P.copy()
+        return P
+
+    def _get_spatial_projection(self, mesh, f):
+        """Spatial projection, possibly the read-only cached matrix itself."""
         P = Zero()
-        field = f._GLoc(self.projField)
-        for strength, comp in zip(self.orientation, ["x", "y", "z"]):
-            if strength != 0.0:
-                P = P + strength * mesh.get_interpolation_matrix(
-                    self.locations, field + comp
-                )
+        grids = _component_grids(f._GLoc(self.projField))
+        locations_key = self.locations.tobytes()
+        for i in self._orientation_idx:
+            strength = self.orientation[i]
+            Pc = _cached_projection(
+                ("spatial", locations_key, grids[i]),
+                mesh,
+                lambda grid=grids[i]: mesh.get_interpolation_matrix(
+                    self.locations, grid
+                ),
+            )
+            P = P + (Pc if strength == 1.0 else strength * Pc)
         return P
 
     def getTimeP(self, time_mesh, f):
@@ -116,6 +316,13 @@ class BaseRx(BaseTimeRx):
         -------
         scipy.sparse.csr_matrix
             P, the interpolation matrix
+
+        Notes
+        -----
+        The projection used by :meth:`getP` is computed once per receiver for
+        each time mesh, type of fields and set of time channels. Subclasses
+        whose time projection depends on other receiver attributes must not
+        change them after the projection has been computed.
         """
         projected_time_grid = f._TLoc(self.projField)
         return time_mesh.get_interpolation_matrix(self.times, projected_time_grid)
@@ -138,19 +345,86 @@ class BaseRx(BaseTimeRx):
 
         Notes
         -----
-        Projection matrices are stored as a dictionary (mesh, time_mesh) if storeProjections is True
+        Projection matrices are stored in a two-level dictionary, keyed by mesh and
+        then time_mesh, if storeProjections is True. Both levels hold weak references
+        to the meshes. The spatial and time projections are always kept in a bounded in-memory cache,
+        see :func:`set_memory_cache` and :func:`clear_memory_cache`.
         """
-        if (mesh, time_mesh) in self._Ps:
-            return self._Ps[(mesh, time_mesh)]
+        P = _get_stored(self._Ps, mesh, time_mesh)
+        if P is not None:
+            return P
+
+        Ps, Pt = self._get_space_time_projections(mesh, time_mesh, f)
+        P = csr_kron(Pt, Ps)
+        if not isinstance(f.dtype, dict) and P.dtype != f.dtype:
+            # store the projection in the precision of the fields it is applied to
+            P = P.astype(f.dtype)
+        if self.storeProjections:
+            self._Ps.setdefault(mesh, WeakKeyDictionary())[time_mesh] = P
+        return P
 
-        Ps = self.getSpatialP(mesh, f)
-        Pt = self.getTimeP(time_mesh, f)
-        P = sp.kron(Pt, Ps)
+    def getPT(self, mesh, time_mesh, f):
+        """Returns the transpose of the projection matrix from fields to receivers.
 
+        Parameters
+        ----------
+        mesh : discretize.BaseMesh
+            A discretize mesh defining spatial discretization
+        time_mesh : discretize.TensorMesh
+            A 1D ``TensorMesh`` defining the time discretization
+        f : simpeg.electromagnetics.time_domain.fields.FieldsTDEM
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+            Transpose of the projection returned by :meth:`getP`.
+
+        Notes
+        -----
+        If storeProjections is True, the transpose is stored in CSR format
+        alongside the projection matrix the first time it is requested, using
+        the same (mesh, time_mesh) keys.
+        """
+        PT = _get_stored(self._PTs, mesh, time_mesh)
+        if PT is not None:
+            return PT
+
+        PT = self.getP(mesh, time_mesh, f).T.tocsr()
+        if self.storeProjections:
+            self._PTs.setdefault(mesh, WeakKeyDictionary())[time_mesh] = PT
+        return PT
+
+    def _get_space_time_projections(self, mesh, time_mesh, f):
+        """Spatial and time projections whose Kronecker product is ``getP``."""
+        Ps = self._get_spatial_projection(mesh, f)
+        per_time_mesh = self._time_Ps.setdefault(time_mesh, {})
+        key = (type(f), self.times.tobytes())
+        Pt = per_time_mesh.get(key)
+        if Pt is None:
+            Pt = per_time_mesh[key] = self.getTimeP(time_mesh, f)
+        return Ps, Pt
+
+    def _get_projection_operator(self, mesh, time_mesh, f):
+        """Projection from fields to receivers used by ``eval`` and ``evalDeriv``.
+
+        Returns the matrix from :meth:`getP` if ``storeProjections`` is
+        ``True``. Otherwise, returns a linear operator applying the Kronecker
+        product of the time and spatial projections without forming it.
+        """
         if self.storeProjections:
-            self._Ps[(mesh, time_mesh)] = P
+            return self.getP(mesh, time_mesh, f)
+        return _KronLinearOperator(
+            *self._get_space_time_projections(mesh, time_mesh, f)
+        )
 
-        return P
+    @staticmethod
+    def _project_fields(P, F):
+        """Apply the projection ``P`` to the space-time field array ``F``."""
+        if isinstance(P, _KronLinearOperator) and F.ndim == 2:
+            # (Pt kron Ps) vec(F) without flattening F
+            return P.project(F)
+        # only copies if F is not already Fortran-contiguous
+        return P @ F.ravel(order="F")
 
     def eval(self, src, mesh, time_mesh, f):  # noqa: A003
         """Project fields to receivers to get data.
@@ -171,9 +445,8 @@ class BaseRx(BaseTimeRx):
         numpy.ndarray
             Fields projected to the receiver(s)
         """
-        P = self.getP(mesh, time_mesh, f)
-        f_part = mkvc(f[src, self.projField, :])
-        return P * f_part
+        P = self._get_projection_operator(mesh, time_mesh, f)
+        return self._project_fields(P, f[src, self.projField, :])
 
     def evalDeriv(self, src, mesh, time_mesh, f, v, adjoint=False):
         """Derivative of projected fields with respect to the inversion model times a vector.
@@ -198,14 +471,15 @@ class BaseRx(BaseTimeRx):
         numpy.ndarray
             derivative of fields times a vector projected to the receiver(s)
         """
-        P = self.getP(mesh, time_mesh, f)
+        P = self._get_projection_operator(mesh, time_mesh, f)
 
         if not adjoint:
-            return P * v
+            return P @ v
         elif adjoint:
-            # dP_dF_T = P.T * v #[src, self]
-            # newshape = (len(dP_dF_T)/time_mesh.nN, time_mesh.nN )
-            return P.T * v  # np.reshape(dP_dF_T, newshape, order='F')
+            # apply the transpose directly rather than forming P.T
+            if isinstance(P, _KronLinearOperator):
+                return P.rmatvec(v)
+            return self.getPT(mesh, time_mesh, f) @ v
 
 
 class PointElectricField(BaseRx):
@@ -221,11 +495,7 @@ class PointElectricField(BaseRx):
         Receiver orientation.
     """
 
-    def __init__(self, locations=None, times=None, orientation="z", **kwargs):
-        self.projField = "e"
-        super(PointElectricField, self).__init__(
-            locations, times, orientation, **kwargs
-        )
+    projField = "e"
 
 
 class PointMagneticFluxDensity(BaseRx):
@@ -241,11 +511,7 @@ class PointMagneticFluxDensity(BaseRx):
         Receiver orientation.
     """
 
-    def __init__(self, locations=None, times=None, orientation="z", **kwargs):
-        self.projField = "b"
-        super(PointMagneticFluxDensity, self).__init__(
-            locations, times, orientation, **kwargs
-        )
+    projField = "b"
 
 
 class PointMagneticFluxTimeDerivative(BaseRx):
@@ -261,11 +527,7 @@ class PointMagneticFluxTimeDerivative(BaseRx):
         Receiver orientation.
     """
 
-    def __init__(self, locations=None, times=None, orientation="z", **kwargs):
-        self.projField = "dbdt"
-        super(PointMagneticFluxTimeDerivative, self).__init__(
-            locations, times, orientation, **kwargs
-        )
+    projField = "dbdt"
 
     def eval(self, src, mesh, time_mesh, f):  # noqa: A003
         """Project solution of fields to receivers to get data.
@@ -292,9 +554,8 @@ class PointMagneticFluxTimeDerivative(BaseRx):
                 src, mesh, time_mesh, f
             )
 
-        P = self.getP(mesh, time_mesh, f)
-        f_part = mkvc(f[src, "b", :])
-        return P * f_part
+        P = self._get_projection_operator(mesh, time_mesh, f)
+        return self._project_fields(P, f[src, "b", :])
 
     def getTimeP(self, time_mesh, f):
         """Get time projection matrix from mesh to receivers.
@@ -315,9 +576,12 @@ class PointMagneticFluxTimeDerivative(BaseRx):
         if self.projField in f.aliasFields:
             return super(PointMagneticFluxTimeDerivative, self).getTimeP(time_mesh, f)
 
-        return (
-            time_mesh.get_interpolation_matrix(self.times, "CC")
-            * time_mesh.face_divergence
+        # only depends on the time mesh and the time channels
+        return _cached_projection(
+            ("dbdt_time", self.times.tobytes()),
+            time_mesh,
+            lambda: time_mesh.get_interpolation_matrix(self.times, "CC")
+            * time_mesh.face_divergence,
         )
 
 
@@ -334,8 +598,9 @@ class PointMagneticField(BaseRx):
         Receiver orientation.
     """
 
+    projField = "h"
+
     def __init__(self, locations=None, times=None, orientation="x", **kwargs):
-        self.projField = "h"
         super(PointMagneticField, self).__init__(
             locations, times, orientation, **kwargs
         )
@@ -354,8 +619,9 @@ class PointCurrentDensity(BaseRx):
         Receiver orientation.
     """
 
+    projField = "j"
+
     def __init__(self, locations=None, times=None, orientation="x", **kwargs):
-        self.projField = "j"
         super(PointCurrentDensity, self).__init__(
             locations, times, orientation, **kwargs
         )
@@ -374,8 +640,9 @@ class PointMagneticFieldTimeDerivative(BaseRx):
         Receiver orientation.
     """
 
+    projField = "dhdt"
+
     def __init__(self, locations=None, times=None, orientation="x", **kwargs):
-        self.projField = "dhdt"
         super(PointMagneticFieldTimeDerivative, self).__init__(
             locations, times, orientation, **kwargs
         )
@@ -1,9 +1,20 @@
+import hashlib
+import inspect
+from collections import OrderedDict
+
 import numpy as np
-import scipy.sparse as sp
 
 from ...data import Data
 from ...simulation import BaseTimeSimulation
-from ...utils import mkvc, sdiag, speye, Zero, validate_type, validate_float
+from ...utils import (
+    mkvc,
+    sdiag,
+    speye,
+    Zero,
+    validate_type,
+    validate_float,
+    validate_integer,
+)
 from ..base import BaseEMSimulation
 from .survey import Survey
 from .fields import (
@@ -15,6 +26,142 @@ from .fields import (
     FieldsDerivativesHJ,
 )
 
+try:
+    from pymatsolver import Pardiso
+except ImportError:
+    Pardiso = None
+
+try:
+    from pydiso.mkl_solver import MKLPardisoSolver
+except ImportError:
+    MKLPardisoSolver = None
+
+
+def _same_sparsity(A, B):
+    """Whether two compressed sparse matrices share the same sparsity pattern."""
+    return (
+        getattr(A, "format", None) in ("csr", "csc")
+        and getattr(B, "format", None) == A.format
+        and A.shape == B.shape
+        and np.array_equal(A.indptr, B.indptr)
+        and np.array_equal(A.indices, B.indices)
+    )
+
+
+def _sparse_digest(A):
+    """Digest of the format, shape and stored entries of a sparse matrix."""
+    if A.format not in ("csr", "csc"):
+        A = A.tocsr()
+    digest = hashlib.blake2b(repr((A.format, A.shape)).encode())
+    for array in (A.indptr, A.indices, A.data):
+        digest.update(np.ascontiguousarray(array).view(np.uint8))
+    return digest.digest()
+
+
+def _stack_columns(columns, n_rows):
+    """Stack per-source vectors as the columns of a dense array.
+
+    Parameters
+    ----------
+    columns : list of numpy.ndarray or simpeg.utils.Zero
+        One vector per source. ``Zero`` entries become columns of zeros.
+    n_rows : int
+        Length of the vectors.
+
+    Returns
+    -------
+    (n_rows, n_sources) numpy.ndarray
+    """
+    if columns and not any(isinstance(col, Zero) for col in columns):
+        return np.column_stack(columns).astype(float, copy=False)
+    out = np.zeros((n_rows, len(columns)))
+    for i, col in enumerate(columns):
+        if not isinstance(col, Zero):
+            out[:, i] = col
+    return out
+
+
+# whether a solver class can solve with the transpose of its own factors,
+# updated if a solver instance turns out not to expose them
+_transpose_solve_support = {}
+
+
+def _supports_transpose_solve(solver):
+    """Whether factorizations of ``solver`` can be used for transposed solves.
+
+    Only ``Pardiso`` solvers backed by a ``pydiso`` solver whose public
+    ``solve`` method accepts a ``transpose`` argument qualify.
+    """
+    supported = _transpose_solve_support.get(solver)
+    if supported is None:
+        supported = False
+        if (
+            Pardiso is not None
+            and MKLPardisoSolver is not None
+            and isinstance(solver, type)
+            and issubclass(solver, Pardiso)
+            and callable(getattr(solver, "factor", None))
+        ):
+            try:
+                params = inspect.signature(MKLPardisoSolver.solve).parameters
+            except (TypeError, ValueError):
+                params = {}
+            supported = "transpose" in params
+        _transpose_solve_support[solver] = supported
+    return supported
+
+
+def _writeable(array):
+    """Return ``array``, or a copy of it if it is read-only."""
+    if array.flags.writeable:
+        return array
+    return array.copy(order="A")
+
+
+class _TransposeSolver:
+    r"""Solve with the transpose of a matrix factored by ``Pardiso``.
+
+    The LU factors of :math:`\mathbf{A}` are reused to solve
+    :math:`\mathbf{A^T x} = \mathbf{b}`, so the transposed matrix does not
+    have to be factored separately. The right-hand side is checked like
+    ``pymatsolver`` does before it is handed to ``pydiso``, which copies it
+    if it is not contiguous.
+
+    Parameters
+    ----------
+    Ainv : pymatsolver.Pardiso
+        Factorization of the matrix :math:`\mathbf{A}`.
+    """
+
+    def __init__(self, Ainv):
+        self.Ainv = Ainv
+
+    def __mul__(self, rhs):
+        if not isinstance(rhs, np.ndarray):
+            raise TypeError("Can only multiply by a numpy array.")
+        A = self.Ainv.A
+        n = A.shape[0]
+        if rhs.ndim > 2 or rhs.shape[0] != n:
+            raise ValueError(
+                f"Incorrect shape of rhs. Expected {n} rows, got shape {rhs.shape}."
+            )
+        if rhs.dtype != A.dtype:
+            if not np.can_cast(rhs.dtype, A.dtype, casting="same_kind"):
+                raise TypeError(
+                    f"Cannot solve a system of dtype {A.dtype} with a "
+                    f"right-hand side of dtype {rhs.dtype}."
+                )
+            rhs = rhs.astype(A.dtype)
+        self.Ainv.factor()
+        sol = self.Ainv.solver.solve(rhs, transpose=True)
+        # single right-hand sides are returned as vectors, like pymatsolver
+        if sol.ndim == 2 and sol.shape[1] == 1:
+            return sol[:, 0]
+        return sol
+
+    def clean(self):
+        self.Ainv.clean()
+
 
 class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
     r"""Base class for quasi-static TDEM simulation with finite volume.
@@ -50,11 +197,17 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
         The time-domain EM survey.
     dt_threshold : float
         Threshold used when determining the unique time-step lengths.
+    Adcinv_cache_size : int, default: 0
+        Number of factorizations of the DC system matrix kept across model
+        updates. Only useful if the conductivity is not inverted for.
     """
 
-    def __init__(self, mesh, survey=None, dt_threshold=1e-8, **kwargs):
+    def __init__(
+        self, mesh, survey=None, dt_threshold=1e-8, Adcinv_cache_size=0, **kwargs
+    ):
         super().__init__(mesh=mesh, survey=survey, **kwargs)
         self.dt_threshold = dt_threshold
+        self.Adcinv_cache_size = Adcinv_cache_size
         if self.muMap is not None:
             raise NotImplementedError(
                 "Time domain EM simulations do not support magnetic permeability "
@@ -100,6 +253,362 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
     def dt_threshold(self, value):
         self._dt_threshold = validate_float("dt_threshold", value, min_val=0.0)
 
+    @property
+    def Adcinv_cache_size(self):
+        """Number of factorizations of the DC system matrix kept across model updates.
+
+        Galvanic sources need the solution of a DC problem at the initial time.
+        Model updates that give a DC system matrix already factored, e.g.
+        when the conductivity is not part of the inversion, reuse its
+        factorization. The least recently used factorizations are cleaned
+        first, and all of them are cleaned when the mesh or the time-steps
+        change. By default (``0``), the factorization is cleaned on every
+        model update.
+
+        When the conductivity changes with the model, a cache never gets
+        hits: it keeps up to ``Adcinv_cache_size`` stale factorizations in
+        memory and hashes the DC system matrix after every model update.
+
+        Returns
+        -------
+        int
+            Number of factorizations of the DC system matrix kept.
+        """
+        return self._Adcinv_cache_size
+
+    @Adcinv_cache_size.setter
+    def Adcinv_cache_size(self, value):
+        value = validate_integer("Adcinv_cache_size", value, min_val=0)
+        cache = getattr(self, "_Adcinv_cache", None)
+        Adcinv = getattr(self, "_Adcinv", None)
+        if Adcinv is not None and getattr(self, "_Adcinv_cache_size", 0) == 0:
+            # an uncached factorization would no longer be cleaned on model
+            # updates
+            self._Adcinv = None
+            Adcinv.clean()
+        self._Adcinv_cache_size = value
+        if cache is not None:
+            self._trim_Adcinv_cache(cache[1])
+
+    def _trim_Adcinv_cache(self, cache):
+        """Clean the least recently used DC factorizations beyond the cache size."""
+        while len(cache) > self.Adcinv_cache_size:
+            _, (_, Adcinv) = cache.popitem(last=False)
+            if Adcinv is getattr(self, "_Adcinv", None):
+                self._Adcinv = None
+            Adcinv.clean()
+
+    def _get_Adcinv_cache(self):
+        """DC factorizations kept for the current mesh and time-steps.
+
+        Returns
+        -------
+        collections.OrderedDict
+            Pairs of conductivity and factorization, keyed by a digest of the
+            DC system matrix, from the least to the most recently used.
+        """
+        owner = (self.mesh, self.time_steps)
+        cache = getattr(self, "_Adcinv_cache", None)
+        if cache is None or any(a is not b for a, b in zip(cache[0], owner)):
+            if cache is not None:
+                current = getattr(self, "_Adcinv", None)
+                for _, Adcinv in cache[1].values():
+                    if Adcinv is current:
+                        self._Adcinv = None
+                    Adcinv.clean()
+            cache = self._Adcinv_cache = (owner, OrderedDict())
+        return cache[1]
+
+    @property
+    def _factor_steps(self):
+        """Index of the time-step whose system matrix is factored for each step.
+
+        Consecutive time-steps whose lengths differ by less than
+        :py:attr:`dt_threshold` share a single factorization, built from the
+        first time-step of the group.
+
+        Returns
+        -------
+        (n_steps,) numpy.ndarray of int
+        """
+        time_steps = self.time_steps
+        cache = getattr(self, "_factor_steps_cache", None)
+        if cache is None or cache[0] is not time_steps or cache[1] != self.dt_threshold:
+            new_factor = np.r_[True, np.abs(np.diff(time_steps)) > self.dt_threshold]
+            steps = np.arange(len(time_steps))
+            first = np.maximum.accumulate(np.where(new_factor, steps, 0))
+            cache = (time_steps, self.dt_threshold, first)
+            self._factor_steps_cache = cache
+        return cache[2]
+
+    @property
+    def _Ct_csr(self):
+        """Transpose of the edge curl operator in CSR format.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+        """
+        if getattr(self, "_Ct", None) is None:
+            self._Ct = self.mesh.edge_curl.T.tocsr()
+        return self._Ct
+
+    def _get_curl_curl(self, M):
+        """Edge curl-curl operator weighted by a face inner-product matrix.
+
+        ``C.T @ M @ C`` is kept until ``M`` is rebuilt, so it survives model
+        updates that do not change ``M``.
+
+        Parameters
+        ----------
+        M : (n_faces, n_faces) scipy.sparse.spmatrix
+            Face inner-product matrix.
+
+        Returns
+        -------
+        (n_edges, n_edges) scipy.sparse.csr_matrix
+        """
+        cache = getattr(self, "_curl_curl_cache", None)
+        if cache is None or cache[0] is not M:
+            cache = (M, self._Ct_csr * (M * self.mesh.edge_curl))
+            self._curl_curl_cache = cache
+        return cache[1]
+
+    @property
+    def _Iface(self):
+        """Identity matrix on the mesh faces in CSR format.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+        """
+        if getattr(self, "_I_faces", None) is None:
+            self._I_faces = speye(self.mesh.n_faces).tocsr()
+        return self._I_faces
+
+    def _get_Adiag_cache(self, *matrices):
+        """Return the cache of diagonal system matrices keyed by step length.
+
+        The cache is reset whenever any of the model-dependent matrices used
+        to assemble the diagonal system matrices has been rebuilt.
+
+        Parameters
+        ----------
+        *matrices : scipy.sparse.spmatrix
+            Model-dependent matrices the diagonal system matrices depend on.
+
+        Returns
+        -------
+        dict
+            Diagonal system matrices keyed by the time-step length, along with
+            any of their terms that do not depend on it.
+        """
+        cache = getattr(self, "_Adiag_cache", None)
+        if (
+            cache is None
+            or len(cache[0]) != len(matrices)
+            or any(a is not b for a, b in zip(cache[0], matrices))
+        ):
+            cache = (matrices, {})
+            self._Adiag_cache = cache
+        return cache[1]
+
+    def _factor_Adiag(self, A, Ainv=None, transpose=False):
+        """Factor a diagonal system matrix, reusing a previous factorization.
+
+        Only the step length changes between the diagonal system matrices of
+        different time-steps, so their sparsity patterns are usually the same.
+        If ``Ainv`` supports numerical refactoring (e.g. ``Pardiso``) and was
+        built from a matrix with the same sparsity pattern as ``A``, its
+        symbolic factorization is reused. Otherwise ``Ainv`` is cleaned and
+        ``A`` is factored from scratch.
+
+        Parameters
+        ----------
+        A : scipy.sparse.spmatrix
+            The system matrix to factor.
+        Ainv : pymatsolver.solvers.Base, optional
+            The factorization of the previous system matrix.
+        transpose : bool
+            Whether to return a solver for the transpose of ``A``. If the
+            solver supports it (``Pardiso`` backed by ``pydiso``), the factors
+            of ``A`` are used for transposed solves, otherwise the transpose
+            of ``A`` is factored.
+
+        Returns
+        -------
+        pymatsolver.solvers.Base
+            The factorization of ``A`` (or of its transpose).
+        """
+        if isinstance(Ainv, _TransposeSolver):
+            Ainv = Ainv.Ainv
+        if transpose and not _supports_transpose_solve(self.solver):
+            A = A.T.tocsr()
+            transpose = False
+
+        if Ainv is not None:
+            if Pardiso is not None and isinstance(Ainv, Pardiso):
+                # compare the patterns in canonical (sorted) order, which is
+                # also the order the solver factors them in
+                for M in (Ainv.A, A):
+                    if hasattr(M, "sort_indices"):
+                        M.sort_indices()
+                if _same_sparsity(Ainv.A, A):
+                    Ainv.factor(A)
+                    return _TransposeSolver(Ainv) if transpose else Ainv
+            Ainv.clean()
+        Ainv = self.solver(A, **self.solver_opts)
+        if transpose and not isinstance(
+            getattr(Ainv, "solver", None), MKLPardisoSolver
+        ):
+            # this solver does not expose its factors, factor the transpose
+            _transpose_solve_support[self.solver] = False
+            Ainv.clean()
+            Ainv = self.solver(A.T.tocsr(), **self.solver_opts)
+            transpose = False
+        return _TransposeSolver(Ainv) if transpose else Ainv
+
+    def _Asubdiag_times(self, tInd, u, adjoint=False):
+        """Sub-diagonal system matrix times the fields at the previous time-step.
+
+        Parameters
+        ----------
+        tInd : int
+            The time-step index; between ``[0, n_steps-1]``.
+        u : numpy.ndarray
+            The fields, or a block of fields with one column per source.
+        adjoint : bool
+            Whether to multiply by the transpose of the sub-diagonal matrix.
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        Asubdiag = self.getAsubdiag(tInd)
+        if adjoint:
+            return Asubdiag.T * u
+        return Asubdiag * u
+
+    def _subtract_Asubdiag_times(self, tInd, rhs, u):
+        """Subtract the sub-diagonal system matrix times the previous fields.
+
+        The subtraction is done in place when ``rhs`` is a writeable array,
+        so ``rhs`` must not be a view on storage that is read again, see
+        :meth:`getRHS`. Read-only arrays are copied first.
+
+        Parameters
+        ----------
+        tInd : int
+            The time-step index; between ``[0, n_steps-1]``.
+        rhs : numpy.ndarray
+            The right-hand sides, one column per source.
+        u : numpy.ndarray
+            The fields at the previous time-step, one column per source.
+
+        Returns
+        -------
+        numpy.ndarray
+            The updated right-hand sides.
+        """
+        if not isinstance(rhs, np.ndarray):
+            return rhs - self._Asubdiag_times(tInd, u)
+        rhs = _writeable(rhs)
+        rhs -= self._Asubdiag_times(tInd, u)
+        return rhs
+
+    def _Adiag_Asubdiag_deriv(self, tInd, u_prev, u, v, adjoint=False):
+        """Summed derivatives of the diagonal and sub-diagonal system matrices.
+
+        Computes ``getAdiagDeriv(tInd, u, v) + getAsubdiagDeriv(tInd, u_prev, v)``,
+        or their adjoints, which formulations can override to apply the
+        model derivatives shared by both matrices only once.
+
+        Parameters
+        ----------
+        tInd : int
+            The time-step index; between ``[0, n_steps-1]``.
+        u_prev : numpy.ndarray
+            The solution for the fields at the previous time-step.
+        u : numpy.ndarray
+            The solution for the fields at the current time-step.
+        v : numpy.ndarray
+            The vector. (n_param,) for the standard operation. (n_fields,) for
+            the adjoint operation.
+        adjoint : bool
+            Whether to perform the adjoint operation.
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        return self.getAdiagDeriv(tInd, u, v, adjoint) + self.getAsubdiagDeriv(
+            tInd, u_prev, v, adjoint
+        )
+
+    @property
+    def deleteTheseOnModelUpdate(self):
+        """List of model-dependent properties to delete upon model update.
+
+        Returns
+        -------
+        list of str
+            List of the model-dependent properties to delete upon model update.
+        """
+        # DC matrix factors are cleaned by clean_on_model_update or on
+        # eviction from _Adcinv_cache
+        return super().deleteTheseOnModelUpdate + [
+            "_Adiag_cache",
+            "_scratch",
+            "_Adcinv",
+            "_source_term_cache",
+        ]
+
+    def _survey_key(self):
+        """Key identifying the survey, its sources and the time-steps."""
+        return (self.survey, self.time_steps, list(self.survey.source_list))
+
+    @staticmethod
+    def _same_survey_key(key, other):
+        """Whether two keys from ``_survey_key`` refer to the same objects."""
+        return (
+            key[0] is other[0]
+            and key[1] is other[1]
+            and len(key[2]) == len(other[2])
+            and all(a is b for a, b in zip(key[2], other[2]))
+        )
+
+    def _get_scratch(self, name, build):
+        """Return storage reused by successive ``Jvec`` and ``Jtvec`` calls.
+
+        Inversions call ``Jvec`` and ``Jtvec`` many times per model with
+        arrays of identical shapes, so these are built once and reused until
+        the survey, the time-steps or the model change. Callers must fully
+        overwrite the entries they read. Only use it for storage the size of
+        the fields at a single time-step: storage the size of the fields at
+        every time-step must be released at the end of each call to bound
+        the memory kept by the simulation.
+
+        Parameters
+        ----------
+        name : str
+            Name of the storage.
+        build : callable
+            Function without arguments creating the storage.
+
+        Returns
+        -------
+        object
+            The storage created by ``build``.
+        """
+        key = self._survey_key()
+        scratch = getattr(self, "_scratch", None)
+        if scratch is None or not self._same_survey_key(scratch[0], key):
+            scratch = (key, {})
+            self._scratch = scratch
+        if name not in scratch[1]:
+            scratch[1][name] = build()
+        return scratch[1][name]
+
     def fields(self, m):
         """Compute and return the fields for the model provided.
 
@@ -125,32 +634,28 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
             print("{}\nCalculating fields(m)\n{}".format("*" * 50, "*" * 50))
 
         # timestep to solve forward
+        factor_steps = self._factor_steps
         Ainv = None
         for tInd, dt in enumerate(self.time_steps):
             # keep factors if dt is the same as previous step b/c A will be the
             # same
-            if Ainv is not None and (
-                tInd > 0 and abs(dt - self.time_steps[tInd - 1]) > self.dt_threshold
-            ):
-                Ainv.clean()
-                Ainv = None
-
-            if Ainv is None:
+            if Ainv is None or factor_steps[tInd] != factor_steps[tInd - 1]:
                 A = self.getAdiag(tInd)
                 if self.verbose:
                     print("Factoring...   (dt = {:e})".format(dt))
-                Ainv = self.solver(A, **self.solver_opts)
+                Ainv = self._factor_Adiag(A, Ainv)
                 if self.verbose:
                     print("Done")
 
             rhs = self.getRHS(tInd + 1)  # this is on the nodes of the time mesh
-            Asubdiag = self.getAsubdiag(tInd)
 
             if self.verbose:
                 print("    Solving...   (tInd = {:d})".format(tInd + 1))
 
             # taking a step
-            sol = Ainv * (rhs - Asubdiag * f[:, (self._fieldType + "Solution"), tInd])
+            sol = Ainv * self._subtract_Asubdiag_times(
+                tInd, rhs, f[:, (self._fieldType + "Solution"), tInd]
+            )
 
             if self.verbose:
                 print("    Done...")
@@ -198,74 +703,80 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
         """
 
         if f is None:
+            # fields already sets the model
             f = self.fields(m)
+        else:
+            self.model = m
 
         ftype = self._fieldType + "Solution"  # the thing we solved for
-        self.model = m
 
         # mat to store previous time-step's solution deriv times a vector for
         # each source
         # size: nu x n_sources
+        if self._fieldType in ["b", "j"]:
+            n = self.mesh.n_faces
+        elif self._fieldType in ["e", "h"]:
+            n = self.mesh.n_edges
 
-        # this is a bit silly
-
-        # if self._fieldType == 'b' or self._fieldType == 'j':
-        #     ifields = np.zeros((self.mesh.n_faces, len(Srcs)))
-        # elif self._fieldType == 'e' or self._fieldType == 'h':
-        #     ifields = np.zeros((self.mesh.n_edges, len(Srcs)))
-
-        # for i, src in enumerate(self.survey.source_list):
-        dun_dm_v = np.hstack(
-            [
-                mkvc(self.getInitialFieldsDeriv(src, v, f=f), 2)
-                for src in self.survey.source_list
-            ]
-        )
+        dun_dm_v = np.empty((n, len(self.survey.source_list)), order="F")
+        for i, src in enumerate(self.survey.source_list):
+            dun_dm_v[:, i] = self.getInitialFieldsDeriv(src, v, f=f)
         # can over-write this at each timestep
         # store the field derivs we need to project to calc full deriv
+        # only the time nodes solved for are written, the others stay zero
         df_dm_v = self.Fields_Derivs(self)
 
+        # field derivatives needed by the receivers of each source
+        src_derivs = [
+            [
+                ("{}Deriv".format(projField), getattr(f, "_%sDeriv" % projField, None))
+                for projField in set([rx.projField for rx in src.receiver_list])
+            ]
+            for src in self.survey.source_list
+        ]
+
+        factor_steps = self._factor_steps
         Adiaginv = None
+        JRHS = np.empty_like(dun_dm_v)
 
-        for tInd, dt in zip(range(self.nT), self.time_steps):
+        for tInd in range(self.nT):
             # keep factors if dt is the same as previous step b/c A will be the
             # same
-            if Adiaginv is not None and (tInd > 0 and dt != self.time_steps[tInd - 1]):
-                Adiaginv.clean()
-                Adiaginv = None
-
-            if Adiaginv is None:
+            if Adiaginv is None or factor_steps[tInd] != factor_steps[tInd - 1]:
                 A = self.getAdiag(tInd)
-                Adiaginv = self.solver(A, **self.solver_opts)
-
-            Asubdiag = self.getAsubdiag(tInd)
+                Adiaginv = self._factor_Adiag(A, Adiaginv)
 
+            JRHS.fill(0.0)
             for i, src in enumerate(self.survey.source_list):
                 # here, we are lagging by a timestep, so filling in as we go
-                for projField in set([rx.projField for rx in src.receiver_list]):
-                    df_dmFun = getattr(f, "_%sDeriv" % projField, None)
+                for deriv_name, df_dmFun in src_derivs[i]:
                     # df_dm_v is dense, but we only need the times at
                     # (rx.P.T * ones > 0)
                     # This should be called rx.footprint
 
-                    df_dm_v[src, "{}Deriv".format(projField), tInd] = df_dmFun(
+                    df_dm_v[src, deriv_name, tInd] = df_dmFun(
                         tInd, src, dun_dm_v[:, i], v
                     )
 
                 un_src = f[src, ftype, tInd + 1]
 
                 # cell centered on time mesh
-                dA_dm_v = self.getAdiagDeriv(tInd, un_src, v)
+                dA_dm_v = self._Adiag_Asubdiag_deriv(
+                    tInd, f[src, ftype, tInd], un_src, v
+                )
                 # on nodes of time mesh
                 dRHS_dm_v = self.getRHSDeriv(tInd + 1, src, v)
 
-                dAsubdiag_dm_v = self.getAsubdiagDeriv(tInd, f[src, ftype, tInd], v)
-
-                JRHS = dRHS_dm_v - dAsubdiag_dm_v - dA_dm_v
+                JRHS_src = dRHS_dm_v - dA_dm_v
+                if not isinstance(JRHS_src, Zero):
+                    JRHS[:, i] = JRHS_src
 
-                # step in time and overwrite
-                if tInd != len(self.time_steps + 1):
-                    dun_dm_v[:, i] = Adiaginv * (JRHS - Asubdiag * dun_dm_v[:, i])
+            # step in time and overwrite, solving for all sources at once
+            dun_dm_v = np.reshape(
+                Adiaginv * self._subtract_Asubdiag_times(tInd, JRHS, dun_dm_v),
+                dun_dm_v.shape,
+                order="F",
+            )
 
         Jv = []
         for src in self.survey.source_list:
@@ -280,7 +791,7 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
                     )
                 )
         Adiaginv.clean()
-        # del df_dm_v, dun_dm_v, Asubdiag
+        # del df_dm_v, dun_dm_v
         # return mkvc(Jv)
         return np.hstack(Jv)
 
@@ -316,116 +827,123 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
         """
 
         if f is None:
+            # fields already sets the model
             f = self.fields(m)
+        else:
+            self.model = m
 
-        self.model = m
         ftype = self._fieldType + "Solution"  # the thing we solved for
 
         # Ensure v is a data object.
         if not isinstance(v, Data):
             v = Data(self.survey, v)
 
+        # as large as the fields, so it is released at the end of the call
         df_duT_v = self.Fields_Derivs(self)
 
-        # same size as fields at a single timestep
-        ATinv_df_duT_v = np.zeros(
-            (
-                len(self.survey.source_list),
-                len(f[self.survey.source_list[0], ftype, 0]),
+        # same size as fields at a single timestep, one column per source
+        ATinv_df_duT_v = self._get_scratch(
+            "ATinv_df_duT_v",
+            lambda: np.zeros(
+                (
+                    len(f[self.survey.source_list[0], ftype, 0]),
+                    len(self.survey.source_list),
+                ),
+                dtype=float,
+                order="F",
             ),
-            dtype=float,
         )
         JTv = np.zeros(m.shape, dtype=float)
 
         # Loop over sources and receivers to create a fields object:
         # PT_v, df_duT_v, df_dmT_v
-        # initialize storage for PT_v (don't need to preserve over sources)
-        PT_v = self.Fields_Derivs(self)
-        for src in self.survey.source_list:
-            # Looping over initializing field class is appending memory!
-            # PT_v = Fields_Derivs(self.mesh) # initialize storage
-            # #for PT_v (don't need to preserve over sources)
-            # initialize size
-            df_duT_v[src, "{}Deriv".format(self._fieldType), :] = np.zeros_like(
-                f[src, self._fieldType, :]
+        field_deriv = "{}Deriv".format(self._fieldType)
+        # adjoint derivative of each field projected by the receivers
+        df_duT_funs = {
+            projField: getattr(f, "_{}Deriv".format(projField), None)
+            for projField in set(
+                rx.projField
+                for src in self.survey.source_list
+                for rx in src.receiver_list
             )
+        }
+        for src in self.survey.source_list:
+            # accumulate the derivatives for this source before storing them
+            df_duT_src = np.zeros_like(f[src, self._fieldType, :])
 
             for rx in src.receiver_list:
-                PT_v[src, "{}Deriv".format(rx.projField), :] = rx.evalDeriv(
-                    src, self.mesh, self.time_mesh, f, mkvc(v[src, rx]), adjoint=True
-                )  # this is +=
-
-                # PT_v = np.reshape(curPT_v,(len(curPT_v)/self.time_mesh.nN,
-                # self.time_mesh.nN), order='F')
-                df_duTFun = getattr(f, "_{}Deriv".format(rx.projField), None)
-
-                for tInd in range(self.nT + 1):
-                    cur = df_duTFun(
-                        tInd,
+                # one column per node of the time mesh
+                PT_v = np.reshape(
+                    rx.evalDeriv(
                         src,
-                        None,
-                        mkvc(PT_v[src, "{}Deriv".format(rx.projField), tInd]),
+                        self.mesh,
+                        self.time_mesh,
+                        f,
+                        mkvc(v[src, rx]),
                         adjoint=True,
-                    )
+                    ),
+                    (-1, self.nT + 1),
+                    order="F",
+                )
+                df_duTFun = df_duT_funs[rx.projField]
 
-                    df_duT_v[src, "{}Deriv".format(self._fieldType), tInd] = df_duT_v[
-                        src, "{}Deriv".format(self._fieldType), tInd
-                    ] + mkvc(cur[0], 2)
-                    JTv = cur[1] + JTv
+                # only the time nodes the receiver samples contribute
+                for tInd in np.flatnonzero(np.any(PT_v != 0, axis=0)).tolist():
+                    cur = df_duTFun(tInd, src, None, PT_v[:, tInd], adjoint=True)
+                    if not isinstance(cur[0], Zero):
+                        df_duT_src[:, tInd] += np.reshape(cur[0], -1)
+                    if not isinstance(cur[1], Zero):
+                        JTv += cur[1]
 
-        del PT_v  # no longer need this
+            df_duT_v[src, field_deriv, :] = df_duT_src
 
+        factor_steps = self._factor_steps
         AdiagTinv = None
 
         # Do the back-solve through time
         # if the previous timestep is the same: no need to refactor the matrix
         # for tInd, dt in zip(range(self.nT), self.time_steps):
 
+        ATinv_df_duT_v.fill(0.0)
+        solved = False
         for tInd in reversed(range(self.nT)):
             # tInd = tIndP - 1
-            if AdiagTinv is not None and (
-                tInd <= self.nT and self.time_steps[tInd] != self.time_steps[tInd + 1]
-            ):
-                AdiagTinv.clean()
-                AdiagTinv = None
+            # solve against df_duT_v for all sources at once
+            rhs = df_duT_v[:, field_deriv, tInd + 1]
+            if solved:
+                rhs = rhs - self._Asubdiag_times(tInd + 1, ATinv_df_duT_v, adjoint=True)
+            elif not np.any(rhs):
+                # no data depends on this or any later timestep
+                continue
 
             # refactor if we need to
-            if AdiagTinv is None:  # and tInd > -1:
-                Adiag = self.getAdiag(tInd)
-                AdiagTinv = self.solver(Adiag.T.tocsr(), **self.solver_opts)
+            if AdiagTinv is None or factor_steps[tInd] != factor_steps[tInd + 1]:
+                Adiag = self.getAdiag(factor_steps[tInd])
+                AdiagTinv = self._factor_Adiag(Adiag, AdiagTinv, transpose=True)
 
-            if tInd < self.nT - 1:
-                Asubdiag = self.getAsubdiag(tInd + 1)
+            ATinv_df_duT_v[:] = np.reshape(
+                AdiagTinv * rhs, ATinv_df_duT_v.shape, order="F"
+            )
+            solved = True
 
             for isrc, src in enumerate(self.survey.source_list):
-                # solve against df_duT_v
-                if tInd >= self.nT - 1:
-                    # last timestep (first to be solved)
-                    ATinv_df_duT_v[isrc, :] = (
-                        AdiagTinv
-                        * df_duT_v[src, "{}Deriv".format(self._fieldType), tInd + 1]
-                    )
-                elif tInd > -1:
-                    ATinv_df_duT_v[isrc, :] = AdiagTinv * (
-                        mkvc(df_duT_v[src, "{}Deriv".format(self._fieldType), tInd + 1])
-                        - Asubdiag.T * mkvc(ATinv_df_duT_v[isrc, :])
-                    )
-
-                dAsubdiagT_dm_v = self.getAsubdiagDeriv(
-                    tInd, f[src, ftype, tInd], ATinv_df_duT_v[isrc, :], adjoint=True
-                )
-
                 dRHST_dm_v = self.getRHSDeriv(
-                    tInd + 1, src, ATinv_df_duT_v[isrc, :], adjoint=True
+                    tInd + 1, src, ATinv_df_duT_v[:, isrc], adjoint=True
                 )  # on nodes of time mesh
 
                 un_src = f[src, ftype, tInd + 1]
                 # cell centered on time mesh
-                dAT_dm_v = self.getAdiagDeriv(
-                    tInd, un_src, ATinv_df_duT_v[isrc, :], adjoint=True
+                dAT_dm_v = self._Adiag_Asubdiag_deriv(
+                    tInd,
+                    f[src, ftype, tInd],
+                    un_src,
+                    ATinv_df_duT_v[:, isrc],
+                    adjoint=True,
                 )
 
-                JTv = JTv + mkvc(-dAT_dm_v - dAsubdiagT_dm_v + dRHST_dm_v)
+                dJTv = dRHST_dm_v - dAT_dm_v
+                if not isinstance(dJTv, Zero):
+                    JTv += np.reshape(dJTv, -1)
 
         # Treat the initial condition
 
@@ -433,7 +951,27 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
         if AdiagTinv is not None:
             AdiagTinv.clean()
 
-        return mkvc(JTv).astype(float)
+        return JTv
+
+    def getRHS(self, tInd):
+        """Right-hand sides of the system at the time index provided.
+
+        Parameters
+        ----------
+        tInd : int
+            The time index. Value between ``[0, n_steps]``.
+
+        Returns
+        -------
+        numpy.ndarray
+            The right-hand sides, one column per source. The time-stepping
+            updates them in place, so implementations must return a new array
+            rather than storage that is read again, e.g. a cached source term.
+            Read-only arrays are copied before they are updated.
+        """
+        raise NotImplementedError(
+            "getRHS has not been implemented for this simulation."
+        )
 
     def getSourceTerm(self, tInd):
         r"""Return the discrete source terms for the time index provided.
@@ -467,19 +1005,55 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
         Srcs = self.survey.source_list
 
         if self._formulation == "EB":
-            s_m = np.zeros((self.mesh.n_faces, len(Srcs)))
-            s_e = np.zeros((self.mesh.n_edges, len(Srcs)))
+            n_m, n_e = self.mesh.n_faces, self.mesh.n_edges
         elif self._formulation == "HJ":
-            s_m = np.zeros((self.mesh.n_edges, len(Srcs)))
-            s_e = np.zeros((self.mesh.n_faces, len(Srcs)))
+            n_m, n_e = self.mesh.n_edges, self.mesh.n_faces
 
-        for i, src in enumerate(Srcs):
-            smi, sei = src.eval(self, self.times[tInd])
-            s_m[:, i] = s_m[:, i] + smi
-            s_e[:, i] = s_e[:, i] + sei
+        s = [src.eval(self, self.times[tInd]) for src in Srcs]
+        s_m = _stack_columns([smi for smi, _ in s], n_m)
+        s_e = _stack_columns([sei for _, sei in s], n_e)
 
         return s_m, s_e
 
+    def _get_source_term_cached(self, tInd):
+        """Source terms for the given time index, reusing recent evaluations.
+
+        The right-hand sides of the e and j formulations need the source
+        terms at ``tInd`` and ``tInd - 1``, so stepping through time would
+        evaluate each of them twice. The two most recently used evaluations
+        are kept, read-only, until the survey, the time-steps or the model
+        change.
+
+        Parameters
+        ----------
+        tInd : int
+            The time index. Value between ``[0, n_steps]``.
+
+        Returns
+        -------
+        s_m : numpy.ndarray
+            The magnetic sources terms.
+        s_e : numpy.ndarray
+            The electric sources terms.
+        """
+        key = self._survey_key()
+        cache = getattr(self, "_source_term_cache", None)
+        if cache is None or not self._same_survey_key(cache[0], key):
+            cache = (key, OrderedDict())
+            self._source_term_cache = cache
+        terms = cache[1]
+        if tInd in terms:
+            terms.move_to_end(tInd)
+        else:
+            source_terms = self.getSourceTerm(tInd)
+            for s in source_terms:
+                if isinstance(s, np.ndarray):
+                    s.setflags(write=False)
+            terms[tInd] = source_terms
+            while len(terms) > 2:
+                terms.popitem(last=False)
+        return terms[tInd]
+
     def getInitialFields(self):
         """Returns the fields for all sources at the initial time.
 
@@ -492,19 +1066,20 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
         Srcs = self.survey.source_list
 
         if self._fieldType in ["b", "j"]:
-            ifields = np.zeros((self.mesh.n_faces, len(Srcs)))
+            n = self.mesh.n_faces
         elif self._fieldType in ["e", "h"]:
-            ifields = np.zeros((self.mesh.n_edges, len(Srcs)))
+            n = self.mesh.n_edges
 
         if self.verbose:
             print("Calculating Initial fields")
 
-        for i, src in enumerate(Srcs):
-            ifields[:, i] = ifields[:, i] + getattr(
-                src, "{}Initial".format(self._fieldType), None
-            )(self)
-
-        return ifields
+        return _stack_columns(
+            [
+                getattr(src, "{}Initial".format(self._fieldType), None)(self)
+                for src in Srcs
+            ],
+            n,
+        )
 
     def getInitialFieldsDeriv(self, src, v, adjoint=False, f=None):
         r"""Derivative of the initial fields with respect to the model for a given source.
@@ -548,19 +1123,23 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
             )
         )
 
-        # take care of any utils.zero cases
+        # take care of any utils.zero cases, other values are returned as is
         if adjoint is False:
-            if self._fieldType in ["b", "j"]:
-                ifieldsDeriv += np.zeros(self.mesh.n_faces)
-            elif self._fieldType in ["e", "h"]:
-                ifieldsDeriv += np.zeros(self.mesh.n_edges)
+            if isinstance(ifieldsDeriv, Zero):
+                if self._fieldType in ["b", "j"]:
+                    ifieldsDeriv = np.zeros(self.mesh.n_faces)
+                elif self._fieldType in ["e", "h"]:
+                    ifieldsDeriv = np.zeros(self.mesh.n_edges)
 
         elif adjoint is True:
             if self._fieldType in ["b", "j"]:
-                ifieldsDeriv += np.zeros(self.mesh.n_faces)
+                if isinstance(ifieldsDeriv, Zero):
+                    ifieldsDeriv = np.zeros(self.mesh.n_faces)
             elif self._fieldType in ["e", "h"]:
-                ifieldsDeriv[0] += np.zeros(self.mesh.n_edges)
-            ifieldsDeriv[1] += np.zeros_like(self.model)  # take care of a  Zero() case
+                if isinstance(ifieldsDeriv[0], Zero):
+                    ifieldsDeriv[0] = np.zeros(self.mesh.n_edges)
+            if isinstance(ifieldsDeriv[1], Zero):
+                ifieldsDeriv[1] = np.zeros_like(self.model)
 
         return ifieldsDeriv
 
@@ -600,11 +1179,31 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
                 "Support for galvanic sources has not been implemented for "
                 "{}-formulation".format(self._fieldType)
             )
+        cache = self._get_Adcinv_cache()
         if getattr(self, "_Adcinv", None) is None:
-            if self.verbose:
-                print("Factoring the system matrix for the DC problem")
-            Adc = self.getAdc()
-            self._Adcinv = self.solver(Adc)
+            # model updates that leave the DC system unchanged (e.g. the
+            # conductivity is not inverted for) reuse a previous factorization,
+            # first by comparing the conductivity, then the assembled matrix
+            sigma = self.sigma
+            key = next(
+                (k for k, (s, _) in cache.items() if np.array_equal(s, sigma)),
+                None,
+            )
+            if key is None:
+                Adc = self.getAdc()
+                key = _sparse_digest(Adc) if self.Adcinv_cache_size > 0 else None
+                if key not in cache:
+                    if self.verbose:
+                        print("Factoring the system matrix for the DC problem")
+                    Adcinv = self.solver(Adc)
+                    if key is None:
+                        # not cached, cleaned on the next model update
+                        self._Adcinv = Adcinv
+                        return Adcinv
+                    cache[key] = (np.array(sigma, copy=True), Adcinv)
+            cache.move_to_end(key)
+            self._Adcinv = cache[key][1]
+            self._trim_Adcinv_cache(cache)
         return self._Adcinv
 
     @property
@@ -620,7 +1219,11 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
             List of the model-dependent attributes to clean upon model update.
         """
         items = super().clean_on_model_update
-        return items + ["_Adcinv"]  #: clear DC matrix factors on any model updates
+        if self.Adcinv_cache_size == 0:
+            # otherwise, DC matrix factors are cleaned when evicted from
+            # _Adcinv_cache
+            items = items + ["_Adcinv"]
+        return items
 
 
 ###############################################################################
@@ -792,15 +1395,22 @@ class Simulation3DMagneticFluxDensity(BaseTDEMSimulation):
 
         dt = self.time_steps[tInd]
         C = self.mesh.edge_curl
+        Ct = self._Ct_csr
         MeSigmaI = self.MeSigmaI
         MfMui = self.MfMui
-        I = speye(self.mesh.n_faces)
 
-        A = 1.0 / dt * I + (C * (MeSigmaI * (C.T.tocsr() * MfMui)))
-
-        if self._makeASymmetric is True:
-            return MfMui.T.tocsr() * A
-        return A
+        # many time-steps share the same step length, assemble once per dt
+        cache = self._get_Adiag_cache(MeSigmaI, MfMui)
+        key = (dt, self._makeASymmetric)
+        if key not in cache:
+            # the curl-curl term does not depend on dt
+            if "curl_curl" not in cache:
+                cache["curl_curl"] = C * (MeSigmaI * (Ct * MfMui))
+            A = 1.0 / dt * self._Iface + cache["curl_curl"]
+            if self._makeASymmetric is True:
+                A = MfMui.T.tocsr() * A
+            cache[key] = A
+        return cache[key]
 
     def getAdiagDeriv(self, tInd, u, v, adjoint=False):
         r"""Derivative operation for the diagonal system matrix times a vector.
@@ -851,6 +1461,7 @@ class Simulation3DMagneticFluxDensity(BaseTDEMSimulation):
             (n_param,) for the adjoint operation.
         """
         C = self.mesh.edge_curl
+        Ct = self._Ct_csr
 
         # def MeSigmaIDeriv(x):
         #     return self.MeSigmaIDeriv(x)
@@ -860,9 +1471,9 @@ class Simulation3DMagneticFluxDensity(BaseTDEMSimulation):
         if adjoint:
             if self._makeASymmetric is True:
                 v = MfMui * v
-            return self.MeSigmaIDeriv(C.T * (MfMui * u), C.T * v, adjoint)
+            return self.MeSigmaIDeriv(Ct * (MfMui * u), Ct * v, adjoint)
 
-        ADeriv = C * (self.MeSigmaIDeriv(C.T * (MfMui * u), v, adjoint))
+        ADeriv = C * (self.MeSigmaIDeriv(Ct * (MfMui * u), v, adjoint))
 
         if self._makeASymmetric is True:
             return MfMui.T * ADeriv
@@ -894,13 +1505,35 @@ class Simulation3DMagneticFluxDensity(BaseTDEMSimulation):
 
         dt = self.time_steps[tInd]
         MfMui = self.MfMui
-        Asubdiag = -1.0 / dt * sp.eye(self.mesh.n_faces)
+        Asubdiag = -1.0 / dt * self._Iface
 
         if self._makeASymmetric is True:
             return MfMui.T * Asubdiag
 
         return Asubdiag
 
+    def _Asubdiag_times(self, tInd, u, adjoint=False):
+        # the sub-diagonal is a scaled identity, so skip building it
+        u = (-1.0 / self.time_steps[tInd]) * u
+        if self._makeASymmetric is True:
+            MfMui = self.MfMui
+            return (MfMui if adjoint else MfMui.T) * u
+        return u
+
+    def _subtract_Asubdiag_times(self, tInd, rhs, u):
+        if not isinstance(rhs, np.ndarray):
+            return super()._subtract_Asubdiag_times(tInd, rhs, u)
+        rhs = _writeable(rhs)
+        # rhs - B_k u = rhs + u / dt, accumulated without forming B_k u
+        scale = 1.0 / self.time_steps[tInd]
+        if self._makeASymmetric is True:
+            u = self.MfMui.T * u
+            u *= scale
+            rhs += u
+        else:
+            rhs += scale * u
+        return rhs
+
     def getAsubdiagDeriv(self, tInd, u, v, adjoint=False):
         r"""Derivative operation for the sub-diagonal system matrix times a vector.
 
@@ -1047,12 +1680,14 @@ class Simulation3DMagneticFluxDensity(BaseTDEMSimulation):
         if adjoint:
             if self._makeASymmetric is True:
                 v = self.MfMui * v
+            # shared by both the conductivity and the source derivatives
+            Ct_v = self._Ct_csr * v
             if isinstance(s_e, Zero):
                 MeSigmaIDerivT_v = Zero()
             else:
-                MeSigmaIDerivT_v = self.MeSigmaIDeriv(s_e, C.T * v, adjoint)
+                MeSigmaIDerivT_v = self.MeSigmaIDeriv(s_e, Ct_v, adjoint)
 
-            RHSDeriv = MeSigmaIDerivT_v + s_eDeriv(MeSigmaI.T * (C.T * v)) + s_mDeriv(v)
+            RHSDeriv = MeSigmaIDerivT_v + s_eDeriv(MeSigmaI.T * Ct_v) + s_mDeriv(v)
 
             return RHSDeriv
 
@@ -1061,7 +1696,8 @@ class Simulation3DMagneticFluxDensity(BaseTDEMSimulation):
         else:
             MeSigmaIDeriv_v = self.MeSigmaIDeriv(s_e, v, adjoint)
 
-        RHSDeriv = C * MeSigmaIDeriv_v + C * MeSigmaI * s_eDeriv(v) + s_mDeriv(v)
+        # apply the curl once to both terms, without forming C * MeSigmaI
+        RHSDeriv = C * (MeSigmaIDeriv_v + MeSigmaI * s_eDeriv(v)) + s_mDeriv(v)
 
         if self._makeASymmetric is True:
             return self.MfMui.T * RHSDeriv
@@ -1200,157 +1836,166 @@ class Simulation3DElectricField(BaseTDEMSimulation):
     def Jtvec(self, m, v, f=None):
         # Doctring inherited from parent class.
         if f is None:
+            # fields already sets the model
             f = self.fields(m)
+        else:
+            self.model = m
 
-        self.model = m
         ftype = self._fieldType + "Solution"  # the thing we solved for
 
         # Ensure v is a data object.
         if not isinstance(v, Data):
             v = Data(self.survey, v)
 
+        # as large as the fields, so it is released at the end of the call
         df_duT_v = self.Fields_Derivs(self)
 
-        # same size as fields at a single timestep
-        ATinv_df_duT_v = np.zeros(
-            (
-                len(self.survey.source_list),
-                len(f[self.survey.source_list[0], ftype, 0]),
+        # same size as fields at a single timestep, one column per source
+        ATinv_df_duT_v = self._get_scratch(
+            "ATinv_df_duT_v",
+            lambda: np.zeros(
+                (
+                    len(f[self.survey.source_list[0], ftype, 0]),
+                    len(self.survey.source_list),
+                ),
+                dtype=float,
+                order="F",
             ),
-            dtype=float,
         )
         JTv = np.zeros(m.shape, dtype=float)
 
         # Loop over sources and receivers to create a fields object:
         # PT_v, df_duT_v, df_dmT_v
-        # initialize storage for PT_v (don't need to preserve over sources)
-        PT_v = self.Fields_Derivs(self)
-        for src in self.survey.source_list:
-            # Looping over initializing field class is appending memory!
-            # PT_v = Fields_Derivs(self.mesh) # initialize storage
-            # #for PT_v (don't need to preserve over sources)
-            # initialize size
-            df_duT_v[src, "{}Deriv".format(self._fieldType), :] = np.zeros_like(
-                f[src, self._fieldType, :]
+        field_deriv = "{}Deriv".format(self._fieldType)
+        # adjoint derivative of each field projected by the receivers
+        df_duT_funs = {
+            projField: getattr(f, "_{}Deriv".format(projField), None)
+            for projField in set(
+                rx.projField
+                for src in self.survey.source_list
+                for rx in src.receiver_list
             )
+        }
+        for src in self.survey.source_list:
+            # accumulate the derivatives for this source before storing them
+            df_duT_src = np.zeros_like(f[src, self._fieldType, :])
 
             for rx in src.receiver_list:
-                PT_v[src, "{}Deriv".format(rx.projField), :] = rx.evalDeriv(
-                    src, self.mesh, self.time_mesh, f, mkvc(v[src, rx]), adjoint=True
-                )
-                # this is +=
-
-                # PT_v = np.reshape(curPT_v,(len(curPT_v)/self.time_mesh.nN,
-                # self.time_mesh.nN), order='F')
-                df_duTFun = getattr(f, "_{}Deriv".format(rx.projField), None)
-
-                for tInd in range(self.nT + 1):
-                    cur = df_duTFun(
-                        tInd,
+                # one column per node of the time mesh
+                PT_v = np.reshape(
+                    rx.evalDeriv(
                         src,
-                        None,
-                        mkvc(PT_v[src, "{}Deriv".format(rx.projField), tInd]),
+                        self.mesh,
+                        self.time_mesh,
+                        f,
+                        mkvc(v[src, rx]),
                         adjoint=True,
-                    )
+                    ),
+                    (-1, self.nT + 1),
+                    order="F",
+                )
+                df_duTFun = df_duT_funs[rx.projField]
 
-                    df_duT_v[src, "{}Deriv".format(self._fieldType), tInd] = df_duT_v[
-                        src, "{}Deriv".format(self._fieldType), tInd
-                    ] + mkvc(cur[0], 2)
-                    JTv = cur[1] + JTv
+                # only the time nodes the receiver samples contribute
+                for tInd in np.flatnonzero(np.any(PT_v != 0, axis=0)).tolist():
+                    cur = df_duTFun(tInd, src, None, PT_v[:, tInd], adjoint=True)
+                    if not isinstance(cur[0], Zero):
+                        df_duT_src[:, tInd] += np.reshape(cur[0], -1)
+                    if not isinstance(cur[1], Zero):
+                        JTv += cur[1]
 
-        # no longer need this
-        del PT_v
+            df_duT_v[src, field_deriv, :] = df_duT_src
 
+        factor_steps = self._factor_steps
         AdiagTinv = None
 
         # Do the back-solve through time
         # if the previous timestep is the same: no need to refactor the matrix
         # for tInd, dt in zip(range(self.nT), self.time_steps):
 
+        ATinv_df_duT_v.fill(0.0)
+        solved = False
         for tInd in reversed(range(self.nT)):
             # tInd = tIndP - 1
-            if AdiagTinv is not None and (
-                tInd <= self.nT and self.time_steps[tInd] != self.time_steps[tInd + 1]
-            ):
-                AdiagTinv.clean()
-                AdiagTinv = None
+            # solve against df_duT_v for all sources at once
+            rhs = df_duT_v[:, field_deriv, tInd + 1]
+            if solved:
+                rhs = rhs - self._Asubdiag_times(tInd + 1, ATinv_df_duT_v, adjoint=True)
+            elif not np.any(rhs):
+                # no data depends on this or any later timestep
+                continue
 
             # refactor if we need to
-            if AdiagTinv is None:  # and tInd > -1:
-                Adiag = self.getAdiag(tInd)
-                AdiagTinv = self.solver(Adiag.T, **self.solver_opts)
+            if AdiagTinv is None or factor_steps[tInd] != factor_steps[tInd + 1]:
+                Adiag = self.getAdiag(factor_steps[tInd])
+                AdiagTinv = self._factor_Adiag(Adiag, AdiagTinv, transpose=True)
 
-            if tInd < self.nT - 1:
-                Asubdiag = self.getAsubdiag(tInd + 1)
+            ATinv_df_duT_v[:] = np.reshape(
+                AdiagTinv * rhs, ATinv_df_duT_v.shape, order="F"
+            )
+            solved = True
 
             for isrc, src in enumerate(self.survey.source_list):
-                # solve against df_duT_v
-                if tInd >= self.nT - 1:
-                    # last timestep (first to be solved)
-                    ATinv_df_duT_v[isrc, :] = (
-                        AdiagTinv
-                        * df_duT_v[src, "{}Deriv".format(self._fieldType), tInd + 1]
-                    )
-                elif tInd > -1:
-                    ATinv_df_duT_v[isrc, :] = AdiagTinv * (
-                        mkvc(df_duT_v[src, "{}Deriv".format(self._fieldType), tInd + 1])
-                        - Asubdiag.T * mkvc(ATinv_df_duT_v[isrc, :])
-                    )
-
-                dAsubdiagT_dm_v = self.getAsubdiagDeriv(
-                    tInd, f[src, ftype, tInd], ATinv_df_duT_v[isrc, :], adjoint=True
-                )
-
                 dRHST_dm_v = self.getRHSDeriv(
-                    tInd + 1, src, ATinv_df_duT_v[isrc, :], adjoint=True
+                    tInd + 1, src, ATinv_df_duT_v[:, isrc], adjoint=True
                 )  # on nodes of time mesh
 
                 un_src = f[src, ftype, tInd + 1]
                 # cell centered on time mesh
-                dAT_dm_v = self.getAdiagDeriv(
-                    tInd, un_src, ATinv_df_duT_v[isrc, :], adjoint=True
+                dAT_dm_v = self._Adiag_Asubdiag_deriv(
+                    tInd,
+                    f[src, ftype, tInd],
+                    un_src,
+                    ATinv_df_duT_v[:, isrc],
+                    adjoint=True,
                 )
 
-                JTv = JTv + mkvc(-dAT_dm_v - dAsubdiagT_dm_v + dRHST_dm_v)
+                dJTv = dRHST_dm_v - dAT_dm_v
+                if not isinstance(dJTv, Zero):
+                    JTv += np.reshape(dJTv, -1)
 
         # Treating initial condition when a galvanic source is included
         tInd = -1
         Grad = self.mesh.nodal_gradient
 
+        galvanic = [
+            isrc
+            for isrc, src in enumerate(self.survey.source_list)
+            if src.srcType == "galvanic"
+        ]
+        if galvanic:
+            # solve the DC problem for all galvanic sources at once
+            rhs = (
+                df_duT_v[:, field_deriv, tInd + 1][:, galvanic]
+                # the initial fields enter the first step through the
+                # sub-diagonal of time-step 0
+                - self._Asubdiag_times(0, ATinv_df_duT_v[:, galvanic], adjoint=True)
+            )
+            ATinv_df_duT_v[:, galvanic] = Grad * np.reshape(
+                self.Adcinv * (Grad.T * rhs), (-1, len(galvanic)), order="F"
+            )
+
         for isrc, src in enumerate(self.survey.source_list):
             if src.srcType == "galvanic":
-                ATinv_df_duT_v[isrc, :] = Grad * (
-                    self.Adcinv
-                    * (
-                        Grad.T
-                        * (
-                            mkvc(
-                                df_duT_v[
-                                    src, "{}Deriv".format(self._fieldType), tInd + 1
-                                ]
-                            )
-                            - Asubdiag.T * mkvc(ATinv_df_duT_v[isrc, :])
-                        )
-                    )
-                )
-
                 dRHST_dm_v = self.getRHSDeriv(
-                    tInd + 1, src, ATinv_df_duT_v[isrc, :], adjoint=True
+                    tInd + 1, src, ATinv_df_duT_v[:, isrc], adjoint=True
                 )  # on nodes of time mesh
 
                 un_src = f[src, ftype, tInd + 1]
                 # cell centered on time mesh
                 dAT_dm_v = self.MeSigmaDeriv(
-                    un_src, ATinv_df_duT_v[isrc, :], adjoint=True
+                    un_src, ATinv_df_duT_v[:, isrc], adjoint=True
                 )
 
-                JTv = JTv + mkvc(-dAT_dm_v + dRHST_dm_v)
+                dJTv = dRHST_dm_v - dAT_dm_v
+                if not isinstance(dJTv, Zero):
+                    JTv += np.reshape(dJTv, -1)
 
         # del df_duT_v, ATinv_df_duT_v, A, Asubdiag
         if AdiagTinv is not None:
             AdiagTinv.clean()
 
-        return mkvc(JTv).astype(float)
+        return JTv
 
     def getAdiag(self, tInd):
         r"""Diagonal system matrix for the time-step index provided.
@@ -1383,11 +2028,14 @@ class Simulation3DElectricField(BaseTDEMSimulation):
         assert tInd >= 0 and tInd < self.nT
 
         dt = self.time_steps[tInd]
-        C = self.mesh.edge_curl
         MfMui = self.MfMui
         MeSigma = self.MeSigma
 
-        return C.T.tocsr() * (MfMui * C) + 1.0 / dt * MeSigma
+        # many time-steps share the same step length, assemble once per dt
+        cache = self._get_Adiag_cache(MfMui, MeSigma)
+        if dt not in cache:
+            cache[dt] = self._get_curl_curl(MfMui) + 1.0 / dt * MeSigma
+        return cache[dt]
 
     def getAdiagDeriv(self, tInd, u, v, adjoint=False):
         r"""Derivative operation for the diagonal system matrix times a vector.
@@ -1477,6 +2125,11 @@ class Simulation3DElectricField(BaseTDEMSimulation):
 
         return -1.0 / dt * self.MeSigma
 
+    def _Asubdiag_times(self, tInd, u, adjoint=False):
+        # the sub-diagonal is a scaled MeSigma, which is symmetric, so skip
+        # building it and its transpose
+        return (-1.0 / self.time_steps[tInd]) * (self.MeSigma * u)
+
     def getAsubdiagDeriv(self, tInd, u, v, adjoint=False):
         r"""Derivative operation for the sub-diagonal system matrix times a vector.
 
@@ -1528,6 +2181,11 @@ class Simulation3DElectricField(BaseTDEMSimulation):
 
         return -1.0 / dt * self.MeSigmaDeriv(u, v, adjoint)
 
+    def _Adiag_Asubdiag_deriv(self, tInd, u_prev, u, v, adjoint=False):
+        # both matrices only depend on the model through MeSigma / dt
+        dt = self.time_steps[tInd]
+        return 1.0 / dt * self.MeSigmaDeriv(u - u_prev, v, adjoint)
+
     def getRHS(self, tInd):
         r"""Right-hand sides for the given time index.
 
@@ -1565,10 +2223,13 @@ class Simulation3DElectricField(BaseTDEMSimulation):
         #     tInd = tInd - 1
 
         dt = self.time_steps[tInd - 1]
-        s_m, s_e = self.getSourceTerm(tInd)
-        _, s_en1 = self.getSourceTerm(tInd - 1)
+        _, s_en1 = self._get_source_term_cached(tInd - 1)
+        s_m, s_e = self._get_source_term_cached(tInd)
 
-        return -1.0 / dt * (s_e - s_en1) + self.mesh.edge_curl.T * self.MfMui * s_m
+        rhs = s_en1 - s_e
+        rhs *= 1.0 / dt
+        rhs += self._Ct_csr * (self.MfMui * s_m)
+        return rhs
 
     def getRHSDeriv(self, tInd, src, v, adjoint=False):
         r"""Derivative of the right-hand side times a vector for a given source and time index.
@@ -1872,11 +2533,14 @@ class Simulation3DMagneticField(BaseTDEMSimulation):
         assert tInd >= 0 and tInd < self.nT
 
         dt = self.time_steps[tInd]
-        C = self.mesh.edge_curl
         MfRho = self.MfRho
         MeMu = self.MeMu
 
-        return C.T * (MfRho * C) + 1.0 / dt * MeMu
+        # many time-steps share the same step length, assemble once per dt
+        cache = self._get_Adiag_cache(MfRho, MeMu)
+        if dt not in cache:
+            cache[dt] = self._get_curl_curl(MfRho) + 1.0 / dt * MeMu
+        return cache[dt]
 
     def getAdiagDeriv(self, tInd, u, v, adjoint=False):
         r"""Derivative operation for the diagonal system matrix times a vector.
@@ -1928,11 +2592,12 @@ class Simulation3DMagneticField(BaseTDEMSimulation):
         assert tInd >= 0 and tInd < self.nT
 
         C = self.mesh.edge_curl
+        Ct = self._Ct_csr
 
         if adjoint:
             return self.MfRhoDeriv(C * u, C * v, adjoint)
 
-        return C.T * self.MfRhoDeriv(C * u, v, adjoint)
+        return Ct * self.MfRhoDeriv(C * u, v, adjoint)
 
     def getAsubdiag(self, tInd):
         r"""Sub-diagonal system matrix for the time-step index provided.
@@ -2040,11 +2705,11 @@ class Simulation3DMagneticField(BaseTDEMSimulation):
         (n_edges, n_sources) numpy.ndarray
             The right-hand sides.
         """
-        C = self.mesh.edge_curl
+        Ct = self._Ct_csr
         MfRho = self.MfRho
         s_m, s_e = self.getSourceTerm(tInd)
 
-        return C.T * (MfRho * s_e) + s_m
+        return Ct * (MfRho * s_e) + s_m
 
     def getRHSDeriv(self, tInd, src, v, adjoint=False):
         r"""Derivative of the right-hand side times a vector for a given source and time index.
@@ -2094,12 +2759,13 @@ class Simulation3DMagneticField(BaseTDEMSimulation):
             (n_param,) for the adjoint operation.
         """
         C = self.mesh.edge_curl
+        Ct = self._Ct_csr
         s_m, s_e = src.eval(self, self.times[tInd])
 
         if adjoint is True:
             return self.MfRhoDeriv(s_e, C * v, adjoint)
         # assumes no source derivs
-        return C.T * self.MfRhoDeriv(s_e, v, adjoint)
+        return Ct * self.MfRhoDeriv(s_e, v, adjoint)
 
     # I DON'T THINK THIS IS CURRENTLY USED BY THE H-FORMULATION.
     def getAdc(self):
@@ -2346,16 +3012,22 @@ class Simulation3DCurrentDensity(BaseTDEMSimulation):
 
         dt = self.time_steps[tInd]
         C = self.mesh.edge_curl
+        Ct = self._Ct_csr
         MfRho = self.MfRho
         MeMuI = self.MeMuI
-        eye = sp.eye(self.mesh.n_faces)
-
-        A = C * (MeMuI * (C.T * MfRho)) + 1.0 / dt * eye
-
-        if self._makeASymmetric:
-            return MfRho.T * A
 
-        return A
+        # many time-steps share the same step length, assemble once per dt
+        cache = self._get_Adiag_cache(MeMuI, MfRho)
+        key = (dt, self._makeASymmetric)
+        if key not in cache:
+            # the curl-curl term does not depend on dt
+            if "curl_curl" not in cache:
+                cache["curl_curl"] = C * (MeMuI * (Ct * MfRho))
+            A = cache["curl_curl"] + 1.0 / dt * self._Iface
+            if self._makeASymmetric:
+                A = MfRho.T * A
+            cache[key] = A
+        return cache[key]
 
     def getAdiagDeriv(self, tInd, u, v, adjoint=False):
         r"""Derivative operation for the diagonal system matrix times a vector.
@@ -2408,15 +3080,16 @@ class Simulation3DCurrentDensity(BaseTDEMSimulation):
         assert tInd >= 0 and tInd < self.nT
 
         C = self.mesh.edge_curl
+        Ct = self._Ct_csr
         MfRho = self.MfRho
         MeMuI = self.MeMuI
 
         if adjoint:
             if self._makeASymmetric:
                 v = MfRho * v
-            return self.MfRhoDeriv(u, C * (MeMuI.T * (C.T * v)), adjoint)
+            return self.MfRhoDeriv(u, C * (MeMuI.T * (Ct * v)), adjoint)
 
-        ADeriv = C * (MeMuI * (C.T * self.MfRhoDeriv(u, v, adjoint)))
+        ADeriv = C * (MeMuI * (Ct * self.MfRhoDeriv(u, v, adjoint)))
         if self._makeASymmetric:
             return MfRho.T * ADeriv
         return ADeriv
@@ -2446,13 +3119,20 @@ class Simulation3DCurrentDensity(BaseTDEMSimulation):
             The sub-diagonal system matrix.
         """
         assert tInd >= 0 and tInd < self.nT
-        eye = sp.eye(self.mesh.n_faces)
 
         dt = self.time_steps[tInd]
 
         if self._makeASymmetric:
             return -1.0 / dt * self.MfRho.T
-        return -1.0 / dt * eye
+        return -1.0 / dt * self._Iface
+
+    def _Asubdiag_times(self, tInd, u, adjoint=False):
+        # the sub-diagonal is a scaled identity, so skip building it
+        u = (-1.0 / self.time_steps[tInd]) * u
+        if self._makeASymmetric:
+            MfRho = self.MfRho
+            return (MfRho if adjoint else MfRho.T) * u
+        return u
 
     def getAsubdiagDeriv(self, tInd, u, v, adjoint=False):
         r"""Derivative operation for the sub-diagonal system matrix times a vector.
@@ -2536,10 +3216,12 @@ class Simulation3DCurrentDensity(BaseTDEMSimulation):
         C = self.mesh.edge_curl
         MeMuI = self.MeMuI
         dt = self.time_steps[tInd]
-        s_m, s_e = self.getSourceTerm(tInd)
-        _, s_en1 = self.getSourceTerm(tInd - 1)
+        _, s_en1 = self._get_source_term_cached(tInd - 1)
+        s_m, s_e = self._get_source_term_cached(tInd)
 
-        rhs = -1.0 / dt * (s_e - s_en1) + C * MeMuI * s_m
+        rhs = s_en1 - s_e
+        rhs *= 1.0 / dt
+        rhs += C * (MeMuI * s_m)
         if self._makeASymmetric:
             return self.MfRho.T * rhs
         return rhs
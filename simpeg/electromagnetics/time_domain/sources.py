@@ -1322,7 +1322,7 @@ class MagDipole(BaseTDEMSrc):
             C = simulation.mesh.edge_curl
 
         elif simulation._formulation == "HJ":
-            C = simulation.mesh.edge_curl.T
+            C = simulation._Ct_csr
 
         return C * self._aSrc(simulation)
 
@@ -1416,10 +1416,10 @@ class MagDipole(BaseTDEMSrc):
         numpy.ndarray
             Electric source term on mesh.
         """
-        C = simulation.mesh.edge_curl
         b = self._bSrc(simulation)
 
         if simulation._formulation == "EB":
+            Ct = simulation._Ct_csr
             MfMui = simulation.mesh.get_face_inner_product(1.0 / self.mu)
 
             if (
@@ -1430,11 +1430,12 @@ class MagDipole(BaseTDEMSrc):
                     return Zero()
                 elif simulation._fieldType == "e":
                     # Compute s_e from vector potential
-                    return C.T * (MfMui * b)
+                    return Ct * (MfMui * b)
             else:
-                return C.T * (MfMui * b) * self.waveform.eval(time)
+                return Ct * (MfMui * b) * self.waveform.eval(time)
 
         elif simulation._formulation == "HJ":
+            C = simulation.mesh.edge_curl
             h = 1.0 / self.mu * b
 
             if (
@@ -1918,9 +1919,7 @@ class LineCurrent(BaseTDEMSrc):
         vol = simulation.mesh.cell_volumes
         Div = sdiag(vol) * simulation.mesh.face_divergence
         return (
-            simulation.mesh.edge_curl
-            * simulation.MeMuI
-            * simulation.mesh.edge_curl.T.tocsr()
+            simulation.mesh.edge_curl * simulation.MeMuI * simulation._Ct_csr
             - Div.T.tocsr()
             * sdiag(1.0 / vol * simulation.mui)
             * Div  # stabalizing term. See (Chen, Haber & Oldenburg 2002)
@@ -2014,7 +2013,7 @@ class LineCurrent(BaseTDEMSrc):
             raise NotImplementedError
 
         a = self._aInitial(simulation)
-        return simulation.mesh.edge_curl.T * a
+        return simulation._Ct_csr * a
 
     def bInitialDeriv(self, simulation, v, adjoint=False, f=None):
         """Compute derivative of intitial magnetic flux density times a vector
@@ -2042,7 +2041,7 @@ class LineCurrent(BaseTDEMSrc):
             return self._aInitialDeriv(
                 simulation, simulation.mesh.edge_curl * v, adjoint=True
             )
-        return simulation.mesh.edge_curl.T * self._aInitialDeriv(simulation, v)
+        return simulation._Ct_csr * self._aInitialDeriv(simulation, v)
 
     def s_m(self, simulation, time):
         """Returns :class:`Zero` for ``LineCurrent``"""
@@ -86,6 +86,7 @@ class UniformBackgroundField(BaseSrc):
         self._inclination = validate_float(
             "inclination", value, min_val=-90.0, max_val=90.0
         )
+        self._b_hat = None
 
     @property
     def declination(self):
@@ -101,13 +102,20 @@ class UniformBackgroundField(BaseSrc):
     @declination.setter
     def declination(self, value):
         self._declination = validate_float("declination", value)
+        self._b_hat = None
+
+    @property
+    def _direction(self):
+        """Unit vector along the background field, kept until the angles change."""
+        if getattr(self, "_b_hat", None) is None:
+            self._b_hat = dip_azimuth2cartesian(
+                self.inclination, self.declination
+            ).squeeze()
+        return self._b_hat
 
     @property
     def b0(self):
-        return (
-            self.amplitude
-            * dip_azimuth2cartesian(self.inclination, self.declination).squeeze()
-        )
+        return self.amplitude * self._direction
 
 
 @deprecate_class(removal_version="0.19.0", error=True)
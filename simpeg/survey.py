@@ -67,8 +67,10 @@ class BaseRx:
 
     @locations.setter
     def locations(self, locs):
-        self._locations = validate_ndarray_with_shape(
-            "locations", locs, shape=("*", "*"), dtype=float
+        self._locations = np.ascontiguousarray(
+            validate_ndarray_with_shape(
+                "locations", locs, shape=("*", "*"), dtype=float
+            )
         )
 
     # @property
@@ -205,8 +207,8 @@ class BaseTimeRx(BaseRx):
 
     @times.setter
     def times(self, value):
-        self._times = validate_ndarray_with_shape(
-            "times", value, shape=("*",), dtype=float
+        self._times = np.ascontiguousarray(
+            validate_ndarray_with_shape("times", value, shape=("*",), dtype=float)
         )
 
     @property
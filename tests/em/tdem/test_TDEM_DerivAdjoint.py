@@ -117,8 +117,9 @@ class Base_DerivAdjoint_Test(unittest.TestCase):
                 prbtype=self.formulation, rxcomp=rxcomp
             )
         )
-        np.random.seed(10)  # use seed for check_derivative
-        tests.check_derivative(derChk, self.m, plotIt=False, num=2, eps=1e-20)
+        tests.check_derivative(
+            derChk, self.m, plotIt=False, num=2, eps=1e-20, random_seed=10
+        )
 
     def JvecVsJtvecTest(self, rxcomp):
         self.set_receiver_list(rxcomp)
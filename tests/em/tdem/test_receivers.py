@@ -0,0 +1,206 @@
+import gc
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+import discretize
+
+from simpeg import maps
+from simpeg.electromagnetics import time_domain as tdem
+from simpeg.electromagnetics.time_domain import receivers
+
+
+@pytest.fixture(scope="module")
+def simulation_and_fields():
+    h = [(10.0, 4, -1.3), (10.0, 6), (10.0, 4, 1.3)]
+    mesh = discretize.TensorMesh([h, h, h], "CCC")
+    times = np.logspace(-5, -4, 3)
+    rx_locs = np.array([[5.0, 5.0, 0.0], [-5.0, 5.0, 0.0]])
+    rx_list = [
+        receivers.PointMagneticFluxDensity(rx_locs, times, orientation="z"),
+        receivers.PointMagneticFluxTimeDerivative(rx_locs, times, orientation="x"),
+        receivers.PointElectricField(rx_locs, times, orientation="y"),
+    ]
+    src = tdem.sources.MagDipole(rx_list, location=np.r_[0.0, 0.0, 10.0])
+    survey = tdem.Survey([src])
+    sim = tdem.Simulation3DMagneticFluxDensity(
+        mesh,
+        survey=survey,
+        sigmaMap=maps.ExpMap(mesh),
+        time_steps=[(1e-5, 10)],
+    )
+    m = np.full(mesh.n_cells, np.log(1e-2))
+    return sim, sim.fields(m)
+
+
+def _dense_projection(rx, sim, f):
+    Ps = rx.getSpatialP(sim.mesh, f)
+    Pt = rx.getTimeP(sim.time_mesh, f)
+    return np.kron(Pt.toarray(), Ps.toarray())
+
+
+def test_projection_cache(simulation_and_fields):
+    sim, f = simulation_and_fields
+    receivers.clear_memory_cache()
+    src = sim.survey.source_list[0]
+    for rx in src.receiver_list:
+        d1 = rx.eval(src, sim.mesh, sim.time_mesh, f)
+        n_cached = len(receivers._projection_cache)
+        d2 = rx.eval(src, sim.mesh, sim.time_mesh, f)
+        assert len(receivers._projection_cache) == n_cached
+        np.testing.assert_allclose(d1, d2)
+
+    receivers.set_memory_cache(0)
+    try:
+        assert len(receivers._projection_cache) == 0
+        rx = src.receiver_list[0]
+        rx.eval(src, sim.mesh, sim.time_mesh, f)
+        assert len(receivers._projection_cache) == 0
+    finally:
+        receivers.set_memory_cache(128)
+
+
+@pytest.mark.parametrize("store_projections", [True, False])
+def test_eval_and_adjoint(simulation_and_fields, store_projections):
+    sim, f = simulation_and_fields
+    receivers.clear_memory_cache()
+    src = sim.survey.source_list[0]
+    rng = np.random.default_rng(42)
+    for rx in src.receiver_list:
+        rx.storeProjections = store_projections
+        P = _dense_projection(rx, sim, f)
+        P_rx = rx.getP(sim.mesh, sim.time_mesh, f)
+        assert P_rx.format == "csr"
+        np.testing.assert_allclose(P_rx.toarray(), P)
+        assert rx.getPT(sim.mesh, sim.time_mesh, f).format == "csr"
+        u = f[src, rx.projField, :].flatten(order="F")
+        np.testing.assert_allclose(rx.eval(src, sim.mesh, sim.time_mesh, f), P @ u)
+
+        v = rng.standard_normal(P.shape[1])
+        w = rng.standard_normal(P.shape[0])
+        np.testing.assert_allclose(
+            rx.evalDeriv(src, sim.mesh, sim.time_mesh, f, v), P @ v
+        )
+        np.testing.assert_allclose(
+            rx.evalDeriv(src, sim.mesh, sim.time_mesh, f, w, adjoint=True), P.T @ w
+        )
+        if store_projections:
+            assert sim.time_mesh in rx._Ps[sim.mesh]
+            assert sim.time_mesh in rx._PTs[sim.mesh]
+        rx.storeProjections = False
+        rx._Ps.clear()
+        rx._PTs.clear()
+
+
+def test_csr_kron():
+    from simpeg.electromagnetics.time_domain._numba_functions import csr_kron
+
+    A = sp.random(7, 5, density=0.4, format="csr", random_state=1)
+    B = sp.random(9, 11, density=0.3, format="csr", random_state=2)
+    K = csr_kron(A, B)
+    assert K.format == "csr"
+    assert K.shape == (63, 55)
+    np.testing.assert_allclose(K.toarray(), sp.kron(A, B).toarray())
+
+
+def test_time_projection_cache_released():
+    receivers.clear_memory_cache()
+    time_mesh = discretize.TensorMesh([np.full(10, 1e-5)])
+    times = np.linspace(1e-5, 8e-5, 4)
+    rx = receivers.PointMagneticFluxTimeDerivative(
+        np.c_[0.0, 0.0, 0.0], times, orientation="z"
+    )
+    f = SimpleNamespace(aliasFields={})
+    Pt = rx.getTimeP(time_mesh, f)
+    assert rx.getTimeP(time_mesh, f) is Pt
+    np.testing.assert_allclose(
+        Pt.toarray(),
+        (
+            time_mesh.get_interpolation_matrix(times, "CC") * time_mesh.face_divergence
+        ).toarray(),
+    )
+    assert len(receivers._projection_cache) == 1
+
+    del time_mesh
+    gc.collect()
+    assert len(receivers._projection_cache) == 0
+
+
+def test_spatial_projection_shared(simulation_and_fields):
+    sim, f = simulation_and_fields
+    receivers.clear_memory_cache()
+    locs = np.array([[5.0, 5.0, 0.0], [-5.0, 5.0, 0.0]])
+    times = np.logspace(-5, -4, 3)
+    rx_b = receivers.PointMagneticFluxDensity(locs, times, orientation="x")
+    rx_dbdt = receivers.PointMagneticFluxTimeDerivative(locs, times, orientation="x")
+    rx_b.getSpatialP(sim.mesh, f)
+    n_cached = len(receivers._projection_cache)
+    Ps = rx_b._get_spatial_projection(sim.mesh, f)
+    assert rx_dbdt._get_spatial_projection(sim.mesh, f) is Ps
+    assert rx_b.getSpatialP(sim.mesh, f) is not Ps
+    assert len(receivers._projection_cache) == n_cached
+
+    rx_oblique = receivers.PointMagneticFluxDensity(
+        locs, times, orientation=np.r_[1.0, 1.0, 0.0]
+    )
+    Ps = rx_oblique.getSpatialP(sim.mesh, f)
+    assert len(receivers._projection_cache) == n_cached + 1
+    expected = (
+        sim.mesh.get_interpolation_matrix(locs, "Fx")
+        + sim.mesh.get_interpolation_matrix(locs, "Fy")
+    ) / np.sqrt(2)
+    np.testing.assert_allclose(Ps.toarray(), expected.toarray())
+
+
+def test_cached_spatial_projection_read_only(simulation_and_fields):
+    sim, f = simulation_and_fields
+    receivers.clear_memory_cache()
+    locs = np.array([[5.0, 5.0, 0.0], [-5.0, 5.0, 0.0]])
+    rx = receivers.PointMagneticFluxDensity(locs, np.r_[1e-5], orientation="z")
+    Ps = rx._get_spatial_projection(sim.mesh, f)
+    assert not Ps.data.flags.writeable
+    with pytest.raises(ValueError):
+        Ps.data *= 2.0
+
+    # the public projection is a copy that can be modified in place
+    P = rx.getSpatialP(sim.mesh, f)
+    P.data *= 2.0
+    np.testing.assert_allclose(
+        Ps.toarray(), sim.mesh.get_interpolation_matrix(locs, "Fz").toarray()
+    )
+    np.testing.assert_allclose(P.toarray(), 2.0 * Ps.toarray())
+
+
+def test_time_projection_per_receiver(simulation_and_fields):
+    sim, f = simulation_and_fields
+
+    class ScaledRx(receivers.PointMagneticFluxDensity):
+        def getTimeP(self, time_mesh, f):
+            return self.scale * super().getTimeP(time_mesh, f)
+
+    locs = np.array([[5.0, 5.0, 0.0]])
+    times = np.logspace(-5, -4, 3)
+    rx1 = ScaledRx(locs, times, orientation="z")
+    rx1.scale = 1.0
+    rx2 = ScaledRx(locs, times, orientation="z")
+    rx2.scale = 2.0
+    P1 = rx1.getP(sim.mesh, sim.time_mesh, f)
+    P2 = rx2.getP(sim.mesh, sim.time_mesh, f)
+    np.testing.assert_allclose(P2.toarray(), 2.0 * P1.toarray())
+
+
+def test_spatial_projection_mesh_geometry():
+    receivers.clear_memory_cache()
+    mesh = discretize.TensorMesh([4, 4, 4], "CCC")
+    locs = np.array([[0.1, -0.05, 0.2]])
+    rx = receivers.PointMagneticFluxDensity(locs, np.r_[1e-5], orientation="z")
+    f = SimpleNamespace(_GLoc=lambda field: "F")
+    rx.getSpatialP(mesh, f)
+
+    # moving the mesh in place does not return the previous projection
+    mesh.origin = mesh.origin + 0.1
+    np.testing.assert_allclose(
+        rx.getSpatialP(mesh, f).toarray(),
+        mesh.get_interpolation_matrix(locs, "Fz").toarray(),
+    )
@@ -0,0 +1,434 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+import discretize
+
+from simpeg import maps
+from simpeg.electromagnetics import time_domain as tdem
+
+
+@pytest.fixture
+def simulation():
+    h = [(10.0, 3, -1.3), (10.0, 4), (10.0, 3, 1.3)]
+    mesh = discretize.TensorMesh([h, h, h], "CCC")
+    times = np.logspace(-5, -4, 3)
+    rx = tdem.receivers.PointMagneticFluxDensity(
+        np.array([[5.0, 5.0, 0.0]]), times, orientation="z"
+    )
+    src = tdem.sources.MagDipole([rx], location=np.r_[0.0, 0.0, 10.0])
+    return tdem.Simulation3DMagneticFluxDensity(
+        mesh,
+        survey=tdem.Survey([src]),
+        sigmaMap=maps.ExpMap(mesh),
+        time_steps=[(1e-5, 4), (2e-5, 4)],
+    )
+
+
+def test_adiag_cache(simulation):
+    sim = simulation
+    sim.model = np.full(sim.mesh.n_cells, np.log(1e-2))
+    A0 = sim.getAdiag(0)
+    assert sim.getAdiag(3) is A0
+    A4 = sim.getAdiag(4)
+    assert A4 is not A0
+
+    C = sim.mesh.edge_curl
+    expected = sim.MfMui.T @ (
+        1.0 / sim.time_steps[4] * np.eye(sim.mesh.n_faces)
+        + (C @ sim.MeSigmaI @ C.T @ sim.MfMui).toarray()
+    )
+    np.testing.assert_allclose(A4.toarray(), expected)
+
+    # updating the model clears the assembled matrices
+    sim.model = np.full(sim.mesh.n_cells, np.log(1e-1))
+    assert sim.getAdiag(0) is not A0
+
+
+def test_factor_adiag_reuse(simulation):
+    pymatsolver = pytest.importorskip("pymatsolver")
+    if not hasattr(pymatsolver, "Pardiso"):
+        pytest.skip("Pardiso solver is not available")
+    sim = simulation
+    sim.solver = pymatsolver.Pardiso
+    sim.model = np.full(sim.mesh.n_cells, np.log(1e-2))
+    Ainv = sim._factor_Adiag(sim.getAdiag(0))
+    A = sim.getAdiag(4)
+    Ainv_new = sim._factor_Adiag(A, Ainv)
+    assert Ainv_new is Ainv
+
+    b = np.random.default_rng(0).standard_normal(sim.mesh.n_faces)
+    np.testing.assert_allclose(A @ (Ainv_new * b), b, atol=1e-8)
+    Ainv_new.clean()
+
+
+@pytest.mark.parametrize(
+    "solver_name", ["Pardiso", "Pardiso_no_transpose_solve", "SolverLU"]
+)
+def test_factor_adiag_transpose(simulation, solver_name, monkeypatch):
+    from simpeg.electromagnetics.time_domain import simulation as tdem_simulation
+
+    sim = simulation
+    if solver_name.startswith("Pardiso"):
+        pymatsolver = pytest.importorskip("pymatsolver")
+        if not hasattr(pymatsolver, "Pardiso"):
+            pytest.skip("Pardiso solver is not available")
+        sim.solver = pymatsolver.Pardiso
+        if solver_name == "Pardiso_no_transpose_solve":
+            monkeypatch.setitem(
+                tdem_simulation._transpose_solve_support, pymatsolver.Pardiso, False
+            )
+    else:
+        from simpeg.utils.solver_utils import SolverLU
+
+        sim.solver = SolverLU
+    sim.model = np.full(sim.mesh.n_cells, np.log(1e-2))
+    # make the system non-symmetric
+    A = sim.getAdiag(0)
+    A = (A + sp.triu(A, k=1)).tocsr()
+    ATinv = sim._factor_Adiag(A, transpose=True)
+    assert isinstance(ATinv, tdem_simulation._TransposeSolver) == (
+        solver_name == "Pardiso"
+    )
+
+    b = np.random.default_rng(0).standard_normal(sim.mesh.n_faces)
+    np.testing.assert_allclose(A.T @ (ATinv * b), b, atol=1e-8)
+    if solver_name == "Pardiso":
+        with pytest.raises(ValueError, match="Incorrect shape of rhs"):
+            ATinv * b[:-1]
+        with pytest.raises(TypeError, match="numpy array"):
+            ATinv * list(b)
+    ATinv.clean()
+
+
+def test_jvec_jtvec_adjoint_multiple_sources(simulation):
+    sim = simulation
+    rx = sim.survey.source_list[0].receiver_list[0]
+    sim.survey = tdem.Survey(
+        [
+            tdem.sources.MagDipole([rx], location=np.r_[0.0, 0.0, z])
+            for z in (10.0, 20.0)
+        ]
+    )
+    m = np.full(sim.mesh.n_cells, np.log(1e-2))
+    f = sim.fields(m)
+
+    rng = np.random.default_rng(0)
+    v = rng.standard_normal(sim.mesh.n_cells)
+    w = rng.standard_normal(sim.survey.nD)
+    np.testing.assert_allclose(
+        w @ sim.Jvec(m, v, f=f), v @ sim.Jtvec(m, w, f=f), rtol=1e-6
+    )
+
+
+def test_factor_steps(simulation):
+    sim = simulation
+    np.testing.assert_array_equal(sim._factor_steps, [0, 0, 0, 0, 4, 4, 4, 4])
+
+    sim.time_steps = np.r_[1e-5, 1e-5 + 1e-10, 2e-5, 2e-5, 1e-5]
+    np.testing.assert_array_equal(sim._factor_steps, [0, 0, 2, 2, 4])
+
+    sim.dt_threshold = 1e-12
+    np.testing.assert_array_equal(sim._factor_steps, [0, 1, 2, 2, 4])
+
+
+@pytest.mark.parametrize(
+    "simulation_class",
+    [
+        tdem.Simulation3DMagneticFluxDensity,
+        tdem.Simulation3DElectricField,
+        tdem.Simulation3DCurrentDensity,
+    ],
+)
+@pytest.mark.parametrize("adjoint", [False, True])
+def test_asubdiag_times(simulation, simulation_class, adjoint):
+    sim = simulation_class(
+        simulation.mesh,
+        survey=simulation.survey,
+        sigmaMap=maps.ExpMap(simulation.mesh),
+        time_steps=simulation.time_steps,
+    )
+    sim.model = np.full(sim.mesh.n_cells, np.log(1e-2))
+    Asubdiag = sim.getAsubdiag(5)
+    if adjoint:
+        Asubdiag = Asubdiag.T
+    u = np.random.default_rng(0).standard_normal((Asubdiag.shape[1], 2))
+    np.testing.assert_allclose(sim._Asubdiag_times(5, u, adjoint=adjoint), Asubdiag @ u)
+    if not adjoint:
+        rhs = np.ones_like(u)
+        np.testing.assert_allclose(
+            sim._subtract_Asubdiag_times(5, rhs, u), 1.0 - Asubdiag @ u
+        )
+
+
+def test_sensitivity_scratch_reuse(simulation):
+    sim = simulation
+    m = np.full(sim.mesh.n_cells, np.log(1e-2))
+    f = sim.fields(m)
+    rng = np.random.default_rng(0)
+    v = rng.standard_normal(sim.mesh.n_cells)
+    w = rng.standard_normal(sim.survey.nD)
+
+    Jv = sim.Jvec(m, v, f=f)
+    Jtw = sim.Jtvec(m, w, f=f)
+    scratch = dict(sim._scratch[1])
+    # only storage for a single time-step is kept between calls
+    assert list(scratch) == ["ATinv_df_duT_v"]
+    assert scratch["ATinv_df_duT_v"].shape == (sim.mesh.n_faces, 1)
+    np.testing.assert_allclose(sim.Jvec(m, v, f=f), Jv)
+    np.testing.assert_allclose(sim.Jtvec(m, w, f=f), Jtw)
+    for name, value in sim._scratch[1].items():
+        assert value is scratch[name]
+
+    # a new model releases the scratch storage
+    sim.model = m + 1.0
+    assert getattr(sim, "_scratch", None) is None
+
+
+def test_jtvec_early_time_receiver(simulation):
+    # no data depends on the late timesteps, so the back-substitution is skipped
+    sim = simulation
+    rx = tdem.receivers.PointMagneticFluxDensity(
+        np.array([[5.0, 5.0, 0.0]]), np.r_[1.5e-5, 2.5e-5], orientation="z"
+    )
+    sim.survey = tdem.Survey(
+        [tdem.sources.MagDipole([rx], location=np.r_[0.0, 0.0, 10.0])]
+    )
+    m = np.full(sim.mesh.n_cells, np.log(1e-2))
+    f = sim.fields(m)
+
+    rng = np.random.default_rng(0)
+    v = rng.standard_normal(sim.mesh.n_cells)
+    w = rng.standard_normal(sim.survey.nD)
+    np.testing.assert_allclose(
+        w @ sim.Jvec(m, v, f=f), v @ sim.Jtvec(m, w, f=f), rtol=1e-6
+    )
+
+
+def test_adcinv_cache(simulation):
+    sim = tdem.Simulation3DElectricField(
+        simulation.mesh,
+        sigmaMap=maps.ExpMap(simulation.mesh),
+        time_steps=simulation.time_steps,
+        Adcinv_cache_size=2,
+    )
+    m1 = np.full(sim.mesh.n_cells, np.log(1e-2))
+    m2 = m1 + 1.0
+    sim.model = m1
+    Adcinv = sim.Adcinv
+    assert sim.Adcinv is Adcinv
+
+    # the factorization is kept for a model giving the same DC system
+    sim.model = m2
+    Adcinv2 = sim.Adcinv
+    assert Adcinv2 is not Adcinv
+    sim.model = m1
+    assert sim.Adcinv is Adcinv
+
+    b = np.random.default_rng(0).standard_normal(sim.mesh.n_nodes)
+    np.testing.assert_allclose(sim.getAdc() @ (Adcinv * b), b, atol=1e-8)
+
+    # the least recently used factorization is discarded
+    sim.model = m1 + 2.0
+    sim.Adcinv
+    factors = [value for _, value in sim._get_Adcinv_cache().values()]
+    assert len(factors) == 2
+    assert any(value is Adcinv for value in factors)
+    assert all(value is not Adcinv2 for value in factors)
+
+    # shrinking the cache cleans the least recently used factorizations
+    sim.Adcinv_cache_size = 1
+    assert len(sim._get_Adcinv_cache()) == 1
+    assert sim.Adcinv is not Adcinv
+
+
+def test_adcinv_cache_cleared(simulation):
+    sim = tdem.Simulation3DElectricField(
+        simulation.mesh,
+        sigmaMap=maps.ExpMap(simulation.mesh),
+        time_steps=simulation.time_steps,
+        Adcinv_cache_size=2,
+    )
+    m = np.full(sim.mesh.n_cells, np.log(1e-2))
+    sim.model = m
+    Adcinv = sim.Adcinv
+
+    # factorizations are not kept across changes of the time-steps
+    sim.time_steps = [(1e-5, 2)]
+    assert sim.Adcinv is not Adcinv
+    assert len(sim._get_Adcinv_cache()) == 1
+
+    # nor at all without a cache
+    sim.Adcinv_cache_size = 0
+    assert len(sim._get_Adcinv_cache()) == 0
+    assert "_Adcinv" in sim.clean_on_model_update
+    Adcinv = sim.Adcinv
+    assert sim.Adcinv is Adcinv
+    sim.model = m + 1.0
+    assert sim.Adcinv is not Adcinv
+
+    # the uncached factorization is cleaned when enabling the cache
+    Adcinv = sim.Adcinv
+    sim.Adcinv_cache_size = 1
+    assert sim.Adcinv is not Adcinv
+    with pytest.raises(ValueError):
+        sim.Adcinv_cache_size = -1
+
+    # no factorization is kept across model updates by default
+    sim = tdem.Simulation3DElectricField(simulation.mesh)
+    assert sim.Adcinv_cache_size == 0
+    assert "_Adcinv" in sim.clean_on_model_update
+
+
+def test_adiag_cache_current_density(simulation):
+    sim = tdem.Simulation3DCurrentDensity(
+        simulation.mesh,
+        sigmaMap=maps.ExpMap(simulation.mesh),
+        time_steps=simulation.time_steps,
+    )
+    sim.model = np.full(sim.mesh.n_cells, np.log(1e-2))
+    A4 = sim.getAdiag(4)
+    assert sim.getAdiag(7) is A4
+
+    C = sim.mesh.edge_curl
+    I = sp.identity(sim.mesh.n_faces)
+    expected = sim.MfRho.T @ (
+        C @ sim.MeMuI @ C.T @ sim.MfRho + 1.0 / sim.time_steps[4] * I
+    )
+    np.testing.assert_allclose(A4.toarray(), expected.toarray())
+
+
+@pytest.mark.parametrize(
+    "simulation_class",
+    [tdem.Simulation3DMagneticFluxDensity, tdem.Simulation3DElectricField],
+)
+@pytest.mark.parametrize("adjoint", [False, True])
+def test_adiag_asubdiag_deriv(simulation, simulation_class, adjoint):
+    sim = simulation_class(
+        simulation.mesh,
+        sigmaMap=maps.ExpMap(simulation.mesh),
+        time_steps=simulation.time_steps,
+    )
+    sim.model = np.full(sim.mesh.n_cells, np.log(1e-2))
+    rng = np.random.default_rng(0)
+    n = sim.getAdiag(0).shape[0]
+    u_prev, u = rng.standard_normal((2, n))
+    v = rng.standard_normal(n if adjoint else sim.mesh.n_cells)
+    expected = sim.getAdiagDeriv(5, u, v, adjoint) + sim.getAsubdiagDeriv(
+        5, u_prev, v, adjoint
+    )
+    np.testing.assert_allclose(
+        sim._Adiag_Asubdiag_deriv(5, u_prev, u, v, adjoint), expected
+    )
+
+
+def test_curl_curl_cache(simulation):
+    sim = tdem.Simulation3DElectricField(
+        simulation.mesh,
+        sigmaMap=maps.ExpMap(simulation.mesh),
+        time_steps=simulation.time_steps,
+    )
+    sim.model = np.full(sim.mesh.n_cells, np.log(1e-2))
+    A4 = sim.getAdiag(4)
+    assert sim.getAdiag(7) is A4
+    CtMC = sim._get_curl_curl(sim.MfMui)
+
+    C = sim.mesh.edge_curl
+    expected = C.T @ sim.MfMui @ C + 1.0 / sim.time_steps[4] * sim.MeSigma
+    np.testing.assert_allclose(A4.toarray(), expected.toarray())
+
+    # MfMui does not depend on the conductivity model
+    sim.model = sim.model + 1.0
+    assert sim.getAdiag(4) is not A4
+    assert sim._get_curl_curl(sim.MfMui) is CtMC
+
+
+def test_jvec_jtvec_adjoint_galvanic_unequal_first_steps(simulation):
+    # the initial fields of galvanic sources couple through the first step
+    rx = tdem.receivers.PointElectricField(
+        np.array([[5.0, 5.0, 0.0]]), np.logspace(-5, -4, 3), orientation="x"
+    )
+    source_list = [
+        tdem.sources.LineCurrent(
+            [rx],
+            location=np.array([[-20.0, y, 0.0], [20.0, y, 0.0]]),
+            waveform=tdem.sources.StepOffWaveform(),
+        )
+        for y in (0.0, 10.0)
+    ]
+    source_list.insert(1, tdem.sources.MagDipole([rx], location=np.r_[0.0, 0.0, 10.0]))
+    sim = tdem.Simulation3DElectricField(
+        simulation.mesh,
+        survey=tdem.Survey(source_list),
+        sigmaMap=maps.ExpMap(simulation.mesh),
+        time_steps=np.r_[1e-5, 3e-5, 2e-5, 2e-5, 4e-5],
+    )
+    m = np.full(sim.mesh.n_cells, np.log(1e-2))
+    f = sim.fields(m)
+
+    rng = np.random.default_rng(0)
+    v = rng.standard_normal(sim.mesh.n_cells)
+    w = rng.standard_normal(sim.survey.nD)
+    np.testing.assert_allclose(
+        w @ sim.Jvec(m, v, f=f), v @ sim.Jtvec(m, w, f=f), rtol=1e-4
+    )
+
+
+@pytest.mark.parametrize(
+    "simulation_class",
+    [tdem.Simulation3DElectricField, tdem.Simulation3DCurrentDensity],
+)
+def test_source_term_cache(simulation, simulation_class, monkeypatch):
+    sim = simulation_class(
+        simulation.mesh,
+        survey=simulation.survey,
+        sigmaMap=maps.ExpMap(simulation.mesh),
+        time_steps=simulation.time_steps,
+    )
+    sim.model = np.full(sim.mesh.n_cells, np.log(1e-2))
+    get_source_term = sim.getSourceTerm
+    with monkeypatch.context() as patch:
+        patch.setattr(sim, "_get_source_term_cached", get_source_term)
+        expected = [sim.getRHS(tInd) for tInd in range(1, sim.nT)]
+
+    calls = []
+
+    def counted(tInd):
+        calls.append(tInd)
+        return get_source_term(tInd)
+
+    monkeypatch.setattr(sim, "getSourceTerm", counted)
+    for tInd, rhs in zip(range(1, sim.nT), expected):
+        np.testing.assert_allclose(sim.getRHS(tInd), rhs)
+    # each source term is evaluated once when stepping through time
+    assert len(calls) == len(set(calls))
+
+
+@pytest.mark.parametrize(
+    "simulation_class",
+    [tdem.Simulation3DMagneticFluxDensity, tdem.Simulation3DElectricField],
+)
+def test_read_only_rhs(simulation, simulation_class, monkeypatch):
+    sim = simulation_class(
+        simulation.mesh,
+        survey=simulation.survey,
+        sigmaMap=simulation.sigmaMap,
+        time_steps=simulation.time_steps,
+    )
+    m = np.full(sim.mesh.n_cells, np.log(1e-2))
+    expected = sim.fields(m)[:, sim._fieldType + "Solution", :]
+
+    get_rhs = sim.getRHS
+    returned = []
+
+    def read_only_rhs(tInd):
+        rhs = np.array(get_rhs(tInd))
+        rhs.setflags(write=False)
+        returned.append((rhs, rhs.copy()))
+        return rhs
+
+    monkeypatch.setattr(sim, "getRHS", read_only_rhs)
+    sim.model = m + 0.0
+    f = sim.fields(m + 0.0)
+    np.testing.assert_allclose(f[:, sim._fieldType + "Solution", :], expected)
+    for rhs, original in returned:
+        np.testing.assert_array_equal(rhs, original)
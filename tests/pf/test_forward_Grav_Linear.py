@@ -7,115 +7,127 @@ from geoana.gravity import Prism
 import numpy as np
 
 
+@pytest.fixture(scope="module")
+def blocks():
+    """Synthetic blocks to build the sample model."""
+    block1 = np.array([[-1.6, 1.6], [-1.6, 1.6], [-1.6, 1.6]])
+    block2 = np.array([[-0.8, 0.8], [-0.8, 0.8], [-0.8, 0.8]])
+    rho1 = 1.0
+    rho2 = 2.0
+    return (block1, block2), (rho1, rho2)
+
+
+@pytest.fixture(scope="module")
+def receivers_locations():
+    nx = 5
+    ny = 5
+    # Create plane of observations
+    xr = np.linspace(-20, 20, nx)
+    yr = np.linspace(-20, 20, ny)
+    x, y = np.meshgrid(xr, yr, sparse=True)
+    receivers_locations = np.empty((nx * ny, 3))
+    receivers_locations[:, 0] = np.broadcast_to(x, (ny, nx)).ravel()
+    receivers_locations[:, 1] = np.broadcast_to(y, (ny, nx)).ravel()
+    receivers_locations[:, 2] = 3.0
+    return receivers_locations
+
+
+@pytest.fixture(scope="module")
+def prisms(blocks):
+    """Dense prisms equivalent to the sample model."""
+    (block1, block2), (rho1, rho2) = blocks
+    # Build prisms (convert densities from g/cc to kg/m3)
+    return [
+        Prism(block1[:, 0], block1[:, 1], rho1 * 1000),
+        Prism(block2[:, 0], block2[:, 1], -rho1 * 1000),
+        Prism(block2[:, 0], block2[:, 1], rho2 * 1000),
+    ]
+
+
+@pytest.fixture(scope="module")
+def analytic_accelerations(prisms, receivers_locations):
+    """Analytic gravity acceleration of the prisms, in mGal."""
+    fields = sum(prism.gravitational_field(receivers_locations) for prism in prisms)
+    fields *= 1e5  # convert to mGal from m/s^2
+    return fields
+
+
+@pytest.fixture(scope="module")
+def analytic_tensor(prisms, receivers_locations):
+    """Analytic gravity gradient tensor of the prisms, in Eotvos."""
+    fields = sum(prism.gravitational_gradient(receivers_locations) for prism in prisms)
+    fields *= 1e9  # convert to Eotvos from 1/s^2
+    return fields
+
+
+@pytest.fixture(scope="module", params=("tensormesh", "treemesh"))
+def mesh(blocks, request):
+    """Sample mesh."""
+    cs = 0.2
+    (block1, _), _ = blocks
+    if request.param == "tensormesh":
+        hxind, hyind, hzind = tuple([(cs, 42)] for _ in range(3))
+        mesh = discretize.TensorMesh([hxind, hyind, hzind], "CCC")
+    else:
+        h = cs * np.ones(64)
+        mesh = discretize.TreeMesh([h, h, h], origin="CCC")
+        x0, x1 = block1[:, 0], block1[:, 1]
+        mesh.refine_box(x0, x1, levels=9)
+    return mesh
+
+
+def get_block_inds(grid, block):
+    return np.where(
+        np.logical_and.reduce(
+            (
+                grid[:, 0] > block[0, 0],
+                grid[:, 0] < block[0, 1],
+                grid[:, 1] > block[1, 0],
+                grid[:, 1] < block[1, 1],
+                grid[:, 2] > block[2, 0],
+                grid[:, 2] < block[2, 1],
+            )
+        )
+    )
+
+
+@pytest.fixture(scope="module")
+def density_and_active_cells(mesh, blocks):
+    """Sample density and active_cells arrays for the sample mesh."""
+    # create a model of two blocks, 1 inside the other
+    (block1, block2), (rho1, rho2) = blocks
+    block1_inds = get_block_inds(mesh.cell_centers, block1)
+    block2_inds = get_block_inds(mesh.cell_centers, block2)
+    # Define densities for each block
+    model = np.zeros(mesh.n_cells)
+    model[block1_inds] = rho1
+    model[block2_inds] = rho2
+    # Define active cells and reduce model
+    active_cells = model != 0.0
+    model_reduced = model[active_cells]
+    return model_reduced, active_cells
+
+
 class TestsGravitySimulation:
     """
     Test gravity simulation.
     """
 
-    @pytest.fixture
-    def blocks(self):
-        """Synthetic blocks to build the sample model."""
-        block1 = np.array([[-1.6, 1.6], [-1.6, 1.6], [-1.6, 1.6]])
-        block2 = np.array([[-0.8, 0.8], [-0.8, 0.8], [-0.8, 0.8]])
-        rho1 = 1.0
-        rho2 = 2.0
-        return (block1, block2), (rho1, rho2)
-
-    @pytest.fixture(params=("tensormesh", "treemesh"))
-    def mesh(self, blocks, request):
-        """Sample mesh."""
-        cs = 0.2
-        (block1, _), _ = blocks
-        if request.param == "tensormesh":
-            hxind, hyind, hzind = tuple([(cs, 42)] for _ in range(3))
-            mesh = discretize.TensorMesh([hxind, hyind, hzind], "CCC")
-        else:
-            h = cs * np.ones(64)
-            mesh = discretize.TreeMesh([h, h, h], origin="CCC")
-            x0, x1 = block1[:, 0], block1[:, 1]
-            mesh.refine_box(x0, x1, levels=9)
-        return mesh
-
     @pytest.fixture
     def simple_mesh(self):
         """Simpler sample mesh, just to use it as a placeholder in some tests."""
         return discretize.TensorMesh([5, 5, 5], "CCC")
 
-    @pytest.fixture
-    def density_and_active_cells(self, mesh, blocks):
-        """Sample density and active_cells arrays for the sample mesh."""
-        # create a model of two blocks, 1 inside the other
-        (block1, block2), (rho1, rho2) = blocks
-        block1_inds = self.get_block_inds(mesh.cell_centers, block1)
-        block2_inds = self.get_block_inds(mesh.cell_centers, block2)
-        # Define densities for each block
-        model = np.zeros(mesh.n_cells)
-        model[block1_inds] = rho1
-        model[block2_inds] = rho2
-        # Define active cells and reduce model
-        active_cells = model != 0.0
-        model_reduced = model[active_cells]
-        return model_reduced, active_cells
-
-    def get_block_inds(self, grid, block):
-        return np.where(
-            (grid[:, 0] > block[0, 0])
-            & (grid[:, 0] < block[0, 1])
-            & (grid[:, 1] > block[1, 0])
-            & (grid[:, 1] < block[1, 1])
-            & (grid[:, 2] > block[2, 0])
-            & (grid[:, 2] < block[2, 1])
-        )
-
-    @pytest.fixture
-    def receivers_locations(self):
-        nx = 5
-        ny = 5
-        # Create plane of observations
-        xr = np.linspace(-20, 20, nx)
-        yr = np.linspace(-20, 20, ny)
-        x, y = np.meshgrid(xr, yr)
-        z = np.ones_like(x) * 3.0
-        receivers_locations = np.vstack([a.ravel() for a in (x, y, z)]).T
-        return receivers_locations
-
-    def get_analytic_solution(self, blocks, survey):
-        """Compute analytical response from dense prism."""
-        (block1, block2), (rho1, rho2) = blocks
-        # Build prisms (convert densities from g/cc to kg/m3)
-        prisms = [
-            Prism(block1[:, 0], block1[:, 1], rho1 * 1000),
-            Prism(block2[:, 0], block2[:, 1], -rho1 * 1000),
-            Prism(block2[:, 0], block2[:, 1], rho2 * 1000),
-        ]
-        # Forward model the prisms
-        components = survey.source_field.receiver_list[0].components
-        receivers_locations = survey.source_field.receiver_list[0].locations
-        if "gx" in components or "gy" in components or "gz" in components:
-            fields = sum(
-                prism.gravitational_field(receivers_locations) for prism in prisms
-            )
-            fields *= 1e5  # convert to mGal from m/s^2
-        else:
-            fields = sum(
-                prism.gravitational_gradient(receivers_locations) for prism in prisms
-            )
-            fields *= 1e9  # convert to Eotvos from 1/s^2
-        return fields
-
     @pytest.mark.parametrize(
         "engine, parallelism",
-        [("geoana", None), ("geoana", 1), ("choclo", False), ("choclo", True)],
+        [("geoana", 1), ("geoana", None), ("choclo", False), ("choclo", True)],
         ids=["geoana_serial", "geoana_parallel", "choclo_serial", "choclo_parallel"],
     )
-    @pytest.mark.parametrize("store_sensitivities", ("ram", "disk", "forward_only"))
     def test_accelerations_vs_analytic(
         self,
         engine,
         parallelism,
-        store_sensitivities,
-        tmp_path,
-        blocks,
+        analytic_accelerations,
         mesh,
         density_and_active_cells,
         receivers_locations,
@@ -131,28 +143,24 @@ class TestsGravitySimulation:
         sources = gravity.SourceField([receivers])
         survey = gravity.Survey(sources)
         # Create reduced identity map for Linear Problem
-        idenMap = maps.IdentityMap(nP=int(sum(active_cells)))
+        idenMap = maps.IdentityMap(nP=int(active_cells.sum()))
         # Create simulation
         if engine == "choclo":
-            sensitivity_path = tmp_path / "sensitivity_choclo"
             kwargs = dict(numba_parallel=parallelism)
         else:
-            sensitivity_path = tmp_path
             kwargs = dict(n_processes=parallelism)
         sim = gravity.Simulation3DIntegral(
             mesh,
             survey=survey,
             rhoMap=idenMap,
             ind_active=active_cells,
-            store_sensitivities=store_sensitivities,
+            store_sensitivities="forward_only",
             engine=engine,
-            sensitivity_path=str(sensitivity_path),
-            sensitivity_dtype=np.float64,
             **kwargs,
         )
         data = sim.dpred(density)
         g_x, g_y, g_z = data[0::3], data[1::3], data[2::3]
-        solution = self.get_analytic_solution(blocks, survey)
+        solution = analytic_accelerations
         # Check results
         rtol, atol = 1e-9, 1e-6
         np.testing.assert_allclose(g_x, solution[:, 0], rtol=rtol, atol=atol)
@@ -161,17 +169,14 @@ class TestsGravitySimulation:
 
     @pytest.mark.parametrize(
         "engine, parallelism",
-        [("geoana", None), ("geoana", 1), ("choclo", False), ("choclo", True)],
+        [("geoana", 1), ("geoana", None), ("choclo", False), ("choclo", True)],
         ids=["geoana_serial", "geoana_parallel", "choclo_serial", "choclo_parallel"],
     )
-    @pytest.mark.parametrize("store_sensitivities", ("ram", "disk", "forward_only"))
     def test_tensor_vs_analytic(
         self,
         engine,
         parallelism,
-        store_sensitivities,
-        tmp_path,
-        blocks,
+        analytic_tensor,
         mesh,
         density_and_active_cells,
         receivers_locations,
@@ -187,29 +192,25 @@ class TestsGravitySimulation:
         sources = gravity.SourceField([receivers])
         survey = gravity.Survey(sources)
         # Create reduced identity map for Linear Problem
-        idenMap = maps.IdentityMap(nP=int(sum(active_cells)))
+        idenMap = maps.IdentityMap(nP=int(active_cells.sum()))
         # Create simulation
         if engine == "choclo":
-            sensitivity_path = tmp_path / "sensitivity_choclo"
             kwargs = dict(numba_parallel=parallelism)
         else:
-            sensitivity_path = tmp_path
             kwargs = dict(n_processes=parallelism)
         sim = gravity.Simulation3DIntegral(
             mesh,
             survey=survey,
             rhoMap=idenMap,
             ind_active=active_cells,
-            store_sensitivities=store_sensitivities,
+            store_sensitivities="forward_only",
             engine=engine,
-            sensitivity_path=str(sensitivity_path),
-            sensitivity_dtype=np.float64,
             **kwargs,
         )
         data = sim.dpred(density)
         g_xx, g_xy, g_xz = data[0::6], data[1::6], data[2::6]
         g_yy, g_yz, g_zz = data[3::6], data[4::6], data[5::6]
-        solution = self.get_analytic_solution(blocks, survey)
+        solution = analytic_tensor
         # Check results
         rtol, atol = 2e-6, 1e-6
         np.testing.assert_allclose(g_xx, solution[..., 0, 0], rtol=rtol, atol=atol)
@@ -224,14 +225,11 @@ class TestsGravitySimulation:
         [("geoana", 1), ("geoana", None), ("choclo", False), ("choclo", True)],
         ids=["geoana_serial", "geoana_parallel", "choclo_serial", "choclo_parallel"],
     )
-    @pytest.mark.parametrize("store_sensitivities", ("ram", "disk", "forward_only"))
     def test_guv_vs_analytic(
         self,
         engine,
         parallelism,
-        store_sensitivities,
-        tmp_path,
-        blocks,
+        analytic_tensor,
         mesh,
         density_and_active_cells,
         receivers_locations,
@@ -247,27 +245,23 @@ class TestsGravitySimulation:
         sources = gravity.SourceField([receivers])
         survey = gravity.Survey(sources)
         # Create reduced identity map for Linear Problem
-        idenMap = maps.IdentityMap(nP=int(sum(active_cells)))
+        idenMap = maps.IdentityMap(nP=int(active_cells.sum()))
         # Create simulation
         if engine == "choclo":
-            sensitivity_path = tmp_path / "sensitivity_choclo"
             kwargs = dict(numba_parallel=parallelism)
         else:
-            sensitivity_path = tmp_path
             kwargs = dict(n_processes=parallelism)
         sim = gravity.Simulation3DIntegral(
             mesh,
             survey=survey,
             rhoMap=idenMap,
             ind_active=active_cells,
-            store_sensitivities=store_sensitivities,
+            store_sensitivities="forward_only",
             engine=engine,
-            sensitivity_path=str(sensitivity_path),
-            sensitivity_dtype=np.float64,
             **kwargs,
         )
         g_uv = sim.dpred(density)
-        solution = self.get_analytic_solution(blocks, survey)
+        solution = analytic_tensor
         g_xx_solution = solution[..., 0, 0]
         g_yy_solution = solution[..., 1, 1]
         g_uv_solution = 0.5 * (g_yy_solution - g_xx_solution)
@@ -275,6 +269,55 @@ class TestsGravitySimulation:
         rtol, atol = 2e-6, 1e-6
         np.testing.assert_allclose(g_uv, g_uv_solution, rtol=rtol, atol=atol)
 
+    @pytest.mark.parametrize("engine", ("choclo", "geoana"))
+    @pytest.mark.parametrize("store_sensitivities", ("ram", "disk"))
+    def test_sensitivity_storage_equivalence(
+        self,
+        engine,
+        store_sensitivities,
+        tmp_path,
+        mesh,
+        density_and_active_cells,
+        receivers_locations,
+    ):
+        """
+        Test if storing the sensitivities gives the same data as forward only.
+        """
+        components = ["gx", "gy", "gz", "gxx", "gxy", "gxz", "gyy", "gyz", "gzz", "guv"]
+        # Unpack fixtures
+        density, active_cells = density_and_active_cells
+        # Create survey
+        receivers = gravity.Point(receivers_locations, components=components)
+        sources = gravity.SourceField([receivers])
+        survey = gravity.Survey(sources)
+        # Create reduced identity map for Linear Problem
+        idenMap = maps.IdentityMap(nP=int(active_cells.sum()))
+        # Create simulations
+        sensitivity_path = tmp_path
+        if engine == "choclo":
+            sensitivity_path /= "sensitivity_choclo"
+        sim = gravity.Simulation3DIntegral(
+            mesh,
+            survey=survey,
+            rhoMap=idenMap,
+            ind_active=active_cells,
+            store_sensitivities=store_sensitivities,
+            engine=engine,
+            sensitivity_path=str(sensitivity_path),
+        )
+        sim_forward_only = gravity.Simulation3DIntegral(
+            mesh,
+            survey=survey,
+            rhoMap=idenMap,
+            ind_active=active_cells,
+            store_sensitivities="forward_only",
+            engine=engine,
+        )
+        # Check results
+        np.testing.assert_allclose(
+            sim.dpred(density), sim_forward_only.dpred(density), rtol=1e-5, atol=1e-5
+        )
+
     @pytest.mark.parametrize("engine", ("choclo", "geoana"))
     @pytest.mark.parametrize("store_sensitivities", ("ram", "disk", "forward_only"))
     def test_sensitivity_dtype(
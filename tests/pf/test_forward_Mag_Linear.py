@@ -30,12 +30,16 @@ def get_block_inds(grid: np.ndarray, block: np.ndarray) -> np.ndarray:
     """
 
     return np.where(
-        (grid[:, 0] > block[0, 0])
-        & (grid[:, 0] < block[0, 1])
-        & (grid[:, 1] > block[1, 0])
-        & (grid[:, 1] < block[1, 1])
-        & (grid[:, 2] > block[2, 0])
-        & (grid[:, 2] < block[2, 1])
+        np.logical_and.reduce(
+            (
+                grid[:, 0] > block[0, 0],
+                grid[:, 0] < block[0, 1],
+                grid[:, 1] > block[1, 0],
+                grid[:, 1] < block[1, 1],
+                grid[:, 2] > block[2, 0],
+                grid[:, 2] < block[2, 1],
+            )
+        )
     )
 
 
@@ -220,7 +224,7 @@ class TestsMagSimulation:
         model, active_cells = create_block_model(mag_mesh, two_blocks, (chi1, chi2))
         model_reduced = model[active_cells]
         # Create reduced identity map for Linear Problem
-        identity_map = maps.IdentityMap(nP=int(sum(active_cells)))
+        identity_map = maps.IdentityMap(nP=int(active_cells.sum()))
 
         survey = create_mag_survey(
             components=["bx", "by", "bz", "tmi"],
@@ -302,7 +306,7 @@ class TestsMagSimulation:
         model, active_cells = create_block_model(mag_mesh, two_blocks, (chi1, chi2))
         model_reduced = model[active_cells]
         # Create reduced identity map for Linear Problem
-        identity_map = maps.IdentityMap(nP=int(sum(active_cells)))
+        identity_map = maps.IdentityMap(nP=int(active_cells.sum()))
 
         survey = create_mag_survey(
             components=["bxx", "bxy", "bxz", "byy", "byz", "bzz"],
@@ -385,7 +389,7 @@ class TestsMagSimulation:
         model, active_cells = create_block_model(mag_mesh, two_blocks, (M1, M2))
         model_reduced = model[active_cells].reshape(-1, order="F")
         # Create reduced identity map for Linear Problem
-        identity_map = maps.IdentityMap(nP=int(sum(active_cells)) * 3)
+        identity_map = maps.IdentityMap(nP=int(active_cells.sum()) * 3)
 
         survey = create_mag_survey(
             components=["bx", "by", "bz", "tmi"],
@@ -465,7 +469,7 @@ class TestsMagSimulation:
         model, active_cells = create_block_model(mag_mesh, two_blocks, (M1, M2))
         model_reduced = model[active_cells].reshape(-1, order="F")
         # Create reduced identity map for Linear Problem
-        identity_map = maps.IdentityMap(nP=int(sum(active_cells)) * 3)
+        identity_map = maps.IdentityMap(nP=int(active_cells.sum()) * 3)
 
         survey = create_mag_survey(
             components=["bx", "by", "bz"],
@@ -676,16 +680,6 @@ def test_ana_mag_tmi_grad_forward():
     block1 = np.array([[-1.5, 1.5], [-1.5, 1.5], [-1.5, 1.5]])
     block2 = np.array([[-0.7, 0.7], [-0.7, 0.7], [-0.7, 0.7]])
 
-    def get_block_inds(grid, block):
-        return np.where(
-            (grid[:, 0] > block[0, 0])
-            & (grid[:, 0] < block[0, 1])
-            & (grid[:, 1] > block[1, 0])
-            & (grid[:, 1] < block[1, 1])
-            & (grid[:, 2] > block[2, 0])
-            & (grid[:, 2] < block[2, 1])
-        )
-
     block1_inds = get_block_inds(mesh.cell_centers, block1)
     block2_inds = get_block_inds(mesh.cell_centers, block2)
 
@@ -697,7 +691,7 @@ def test_ana_mag_tmi_grad_forward():
     model_reduced = model[active_cells]
 
     # Create reduced identity map for Linear Problem
-    idenMap = maps.IdentityMap(nP=int(sum(active_cells)))
+    idenMap = maps.IdentityMap(nP=int(active_cells.sum()))
 
     # Create plane of observations
     xr = np.linspace(-20, 20, nx)
@@ -719,7 +713,7 @@ def test_ana_mag_tmi_grad_forward():
     survey = mag.Survey(srcField)
 
     # Create reduced identity map for Linear Problem
-    idenMap = maps.IdentityMap(nP=int(sum(active_cells)))
+    idenMap = maps.IdentityMap(nP=int(active_cells.sum()))
 
     sim = mag.Simulation3DIntegral(
         mesh,
@@ -67,3 +67,17 @@ def test_value_b0(receiver_list):
         declination=declination,
     )
     np.testing.assert_allclose(uniform_background_field.b0, expected_b0)
+
+
+def test_b0_after_angle_update():
+    """
+    Test if UniformBackgroundField.b0 follows updates of its angles
+    """
+    uniform_background_field = UniformBackgroundField(
+        receiver_list=None, amplitude=55_000, inclination=0, declination=0
+    )
+    np.testing.assert_allclose(uniform_background_field.b0, (0, 55_000, 0), atol=1e-9)
+    uniform_background_field.inclination = 45
+    uniform_background_field.declination = 10
+    expected_b0 = (6753.3292182935065, 38300.03321760104, -38890.87296526011)
+    np.testing.assert_allclose(uniform_background_field.b0, expected_b0)